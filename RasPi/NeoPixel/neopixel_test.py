@@ -1,35 +1,63 @@
-import time
-import board
-import neopixel
+import os
+import sys
+import argparse
+from functools import partial
+
+# Shared helpers (devices.py, pixel_animations.py) live one directory up in RasPi/
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import devices
+import instrument
+from pixel_animations import Animator, sequence, wipe, hold, rainbow, chase
 
 # Configuration
 NUM_PIXELS = 30         # Change this to match your NeoPixel count
-PIXEL_PIN = board.D18  # GPIO18 is PWM-capable and commonly used
+PIXEL_PIN = "D18"      # GPIO18 is PWM-capable and commonly used
 BRIGHTNESS = 0.5       # From 0.0 (off) to 1.0 (max)
-ORDER = neopixel.GRB   # NeoPixel color order
+ORDER = "GRB"          # NeoPixel color order
+FPS = 60               # Frames per second pushed to the strip
+WIPE_STEP = 0.1        # Seconds per pixel in the colour wipes
+
+parser = argparse.ArgumentParser(description="NeoPixel test patterns")
+parser.add_argument("--pixels", type=int, default=NUM_PIXELS, help="strip length")
+parser.add_argument("--fps", type=float, default=FPS)
+parser.add_argument("--effect", choices=("wipe", "rainbow", "chase"), default="wipe")
+parser.add_argument("--duration", type=float, help="seconds to run (default: until Ctrl+C)")
+parser.add_argument("--brightness", type=float, default=BRIGHTNESS)
+parser.add_argument("--dither", action="store_true", help="temporal dithering for smooth low brightness")
+args = parser.parse_args()
+
+# Initialize NeoPixel strip (RASPI_BACKEND=sim for a simulated strip)
+# Gamma and brightness are applied by the animator's lookup table, so the library scales nothing
+pixels = devices.open_pixels(args.pixels, pin=PIXEL_PIN, brightness=1.0, order=ORDER)
+animator = Animator(pixels, args.pixels, fps=args.fps, brightness=args.brightness, order=ORDER, dither=args.dither)
 
-# Initialize NeoPixel strip
-pixels = neopixel.NeoPixel(
-    PIXEL_PIN, NUM_PIXELS, brightness=BRIGHTNESS, auto_write=False, pixel_order=ORDER
-)
+def color_wipe(color):
+    return partial(wipe, color=color, duration=args.pixels * WIPE_STEP)
 
-def color_wipe(color, wait):
-    for i in range(NUM_PIXELS):
-        pixels[i] = color
-        pixels.show()
-        time.sleep(wait)
+if args.effect == "wipe":
+    animator.add(sequence, effects=[
+        color_wipe((255, 0, 0)),      # Red
+        color_wipe((0, 255, 0)),      # Green
+        color_wipe((0, 0, 255)),      # Blue
+        color_wipe((255, 255, 255)),  # White
+        partial(hold, color=(0, 0, 0), duration=1.0),  # Off
+    ])
+elif args.effect == "rainbow":
+    animator.add(rainbow, period=5.0)
+else:
+    animator.add(rainbow, period=20.0, spread=0.2)
+    animator.add(chase, blend="add", color=(255, 255, 255), spacing=4)
 
 try:
-    print("Testing NeoPixels...")
-    while True:
-        color_wipe((255, 0, 0), 0.1)  # Red
-        color_wipe((0, 255, 0), 0.1)  # Green
-        color_wipe((0, 0, 255), 0.1)  # Blue
-        color_wipe((255, 255, 255), 0.1)  # White
-        pixels.fill((0, 0, 0))  # Turn off
-        pixels.show()
-        time.sleep(1)
+    print(f"Testing {args.pixels} NeoPixels ({args.effect})... Ctrl+C to stop")
+    animator.run(duration=args.duration)
 except KeyboardInterrupt:
+    pass
+finally:
     pixels.fill((0, 0, 0))
     pixels.show()
+    stats = animator.stats()
+    print(f"\n{stats['fps']:.1f} fps, {stats['skipped']} frames skipped, "
+          f"{stats['render_ms']:.2f} ms render + {stats['show_ms']:.2f} ms show per frame")
+    instrument.report()  # RASPI_INSTRUMENT=1: per-span timings
     print("Stopped.")
@@ -1,14 +1,64 @@
-from grove.factory import Factory
+import os
+import sys
 import time
+import argparse
 
-oled = Factory.getDisplay("SH1107G")
+# Shared helpers (devices.py, grove_sh1107.py, ...) live one directory up in RasPi/
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import devices
+import instrument
+from oled_renderer import WeightRenderer
+from hx711_sampler import HX711Sampler
+from filters import make_filter
+from calibration_store import CalibrationStore
 
-oled.clear()
-oled.setCursor(0, 0)
-oled.write("Hello, OLED!")
+# ┌──── Grove OLED Live Readings ────┐
+# Shows the live HX711 weight on the Seeed Grove 1.12" SH1107 OLED. Frames
+# are drawn in memory and only changed page spans are sent, each as one bulk
+# I2C write (see grove_sh1107.py), so the panel keeps up with --fps; an
+# unchanged reading sends nothing. RASPI_BACKEND=sim to run without hardware.
 
-oled.setCursor(5, 0)
-oled.write("128x128 SH1107")
+parser = argparse.ArgumentParser(description="Live readings on the Grove SH1107 OLED")
+parser.add_argument("--fps", type=float, default=20.0, help="maximum display refresh rate")
+parser.add_argument("--bus", type=int, default=1, help="I2C bus number")
+parser.add_argument("--address", type=lambda v: int(v, 0), default=0x3C, help="I2C address")
+parser.add_argument("--splash", type=float, default=1.5, help="seconds to show the greeting")
+parser.add_argument("--rotate", type=int, default=0, choices=range(4), help="rotation in 90 degree steps")
+args = parser.parse_args()
 
-time.sleep(50)
-oled.clear()
\ No newline at end of file
+oled = devices.open_grove_oled(bus=args.bus, address=args.address, rotate=args.rotate)
+renderer = WeightRenderer(oled, font_size=28)
+renderer.message((0, 0, "Hello, OLED!"), (0, 40, "128x128 SH1107"))
+splash_until = time.monotonic() + args.splash
+
+# HX711 on DOUT = GPIO6, SCK = GPIO5, using the saved calibration when there is one
+hx = devices.open_hx711(dout=6, sck=5)
+if not CalibrationStore().apply(hx):
+    hx.set_reference_unit(210.0)
+    hx.tare()
+sampler = HX711Sampler(hx, weight_filter=make_filter("spike+median", threshold=50.0, window=5))
+sampler.start()
+sampler.wait_samples(1, timeout=2)
+time.sleep(max(0.0, splash_until - time.monotonic()))  # the HX711 warms up meanwhile
+
+period = 1.0 / args.fps
+frames = updates = 0
+started = time.monotonic()
+print("Showing live readings (Ctrl+C to stop)")
+try:
+    deadline = started
+    while True:
+        if renderer.render(sampler.latest_weight()):
+            updates += 1
+        frames += 1
+        deadline += period
+        time.sleep(max(0.0, deadline - time.monotonic()))
+except KeyboardInterrupt:
+    print()
+finally:
+    elapsed = time.monotonic() - started
+    sampler.stop()
+    oled.cleanup()
+    print(f"{frames / elapsed:.1f} fps, {updates} of {frames} frames changed the panel, "
+          f"{renderer.bytes_sent / max(updates, 1):.0f} bytes per update")
+    instrument.report()
@@ -0,0 +1,210 @@
+import argparse
+import itertools
+import json
+import math
+import sys
+import threading
+import time
+import tracemalloc
+
+import devices
+from filters import make_filter
+from hx711_sampler import HX711Sampler
+from oled_renderer import WeightRenderer
+from pixel_engine import PixelEngine
+from render_scheduler import RenderScheduler
+
+# ┌──── Pipeline Benchmark ────┐
+# Runs the demo pipeline (HX711 sampler -> filter -> OLED / NeoPixel outputs)
+# against the simulated devices and reports:
+#   - samples/s from the sampler and frames/s per output
+#   - p50/p99 sample-to-display latency: age of the sample a frame shows
+#     when that frame has finished writing to the device (frames that left
+#     the device unchanged are not counted)
+#   - CPU time per stage and, with --allocations, bytes allocated per module
+# Every combination of --pixels, --window and --font-size is one run.
+#
+#   python3 benchmark.py --pixels 30,300 --window 5,15 --json results.json
+
+
+class SampleSource:
+    """Scheduler source that remembers which sample each output thread was given"""
+
+    def __init__(self, sampler):
+        self.sampler = sampler
+        self.local = threading.local()
+
+    def __call__(self):
+        sampler = self.sampler
+        count = sampler.count
+        if count == 0:
+            self.local.timestamp = None
+            return sampler.latest_weight()
+        slot = (count - 1) % sampler.size
+        self.local.timestamp = sampler.times[slot]
+        return sampler.filtered_weights[slot]
+
+    def timestamp(self):
+        """Time of the sample last returned to the calling thread"""
+        return getattr(self.local, "timestamp", None)
+
+
+class Stage:
+    """Wrap a callable and account its calls, CPU time and latency"""
+
+    def __init__(self, func, source=None):
+        self.func = func
+        self.source = source     # SampleSource; when set, record sample-to-display latency
+        self.calls = 0
+        self.cpu_time = 0.0
+        self.latencies = []
+
+    def __call__(self, *args):
+        sampled = self.source.timestamp() if self.source is not None else None
+        started = time.thread_time()
+        result = self.func(*args)
+        self.cpu_time += time.thread_time() - started
+        self.calls += 1
+        # Renderers return False when the device already shows the value
+        if sampled is not None and result is not False:
+            self.latencies.append(time.monotonic() - sampled)
+        return result
+
+
+class TimedFilter:
+    """Filter wrapper so the per-sample filter cost shows up as its own stage"""
+
+    def __init__(self, weight_filter):
+        self.filter = weight_filter
+        self.stage = Stage(weight_filter.update)
+
+    def reset(self):
+        self.filter.reset()
+
+    def update(self, value, t=None):
+        return self.stage(value, t)
+
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def test_signal(t):
+    """Grams on the simulated scale: a slow swing so every output has work to do"""
+    return 500.0 + 400.0 * math.sin(t)
+
+
+def run_once(num_pixels, window, font_size, args):
+    hx = devices.open_hx711(backend="sim", signal=test_signal, rate=args.rate, noise=args.noise)
+    hx.set_reference_unit(210.0)
+    hx.tare(times=5)
+    weight_filter = TimedFilter(make_filter(args.filter, window=window))
+    sampler = HX711Sampler(hx, weight_filter=weight_filter)
+    renderer = WeightRenderer(devices.open_oled(backend="sim", rotate=2), font_size=font_size)
+    pixels = devices.open_pixels(num_pixels, backend="sim")
+    engine = PixelEngine(pixels, num_pixels, brightness=0.5)
+
+    source = SampleSource(sampler)
+    oled_stage = Stage(renderer.render, source)
+    pixel_stage = Stage(lambda weight: engine.render_hue(max(0.0, min(1.0, weight / 1000.0)) * 0.8), source)
+    scheduler = RenderScheduler(source)
+    scheduler.add_output("oled", oled_stage, fps=args.oled_fps)
+    scheduler.add_output("neopixel", pixel_stage, fps=args.pixel_fps)
+
+    if args.allocations:
+        tracemalloc.start()
+    started = time.monotonic()
+    sampler.start()
+    scheduler.start()
+    time.sleep(args.duration)
+    scheduler.stop()
+    sampler.stop()
+    elapsed = time.monotonic() - started
+    allocations = {}
+    if args.allocations:
+        snapshot = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+        for stat in snapshot.statistics("filename"):
+            name = stat.traceback[0].filename.rsplit("/", 1)[-1]
+            allocations[name] = allocations.get(name, 0) + stat.size
+
+    frames = scheduler.stats()
+    return {
+        "pixels": num_pixels,
+        "window": window,
+        "font_size": font_size,
+        "filter": args.filter,
+        "duration_s": elapsed,
+        "samples_per_s": sampler.count / elapsed,
+        "outputs": {
+            name: {
+                "fps": frames[name]["fps"],
+                "frames": frames[name]["frames"],
+                "skipped_ticks": frames[name]["skipped_ticks"],
+                "latency_p50_ms": 1000 * percentile(stage.latencies, 0.50),
+                "latency_p99_ms": 1000 * percentile(stage.latencies, 0.99),
+            }
+            for name, stage in (("oled", oled_stage), ("neopixel", pixel_stage))
+        },
+        "cpu_ms": {
+            "filter": 1000 * weight_filter.stage.cpu_time,
+            "oled": 1000 * oled_stage.cpu_time,
+            "neopixel": 1000 * pixel_stage.cpu_time,
+        },
+        "oled_bytes": renderer.bytes_sent,
+        "pixel_bytes": pixels.bytes_written,
+        "allocated_bytes": allocations,
+    }
+
+
+def print_result(result):
+    print(f"pixels={result['pixels']:<5} window={result['window']:<3} font={result['font_size']:<3} "
+          f"samples/s={result['samples_per_s']:7.1f}")
+    for name, output in result["outputs"].items():
+        print(f"    {name:<9} {output['fps']:6.1f} fps   latency p50 {output['latency_p50_ms']:6.1f} ms"
+              f"   p99 {output['latency_p99_ms']:6.1f} ms   cpu {result['cpu_ms'][name]:7.1f} ms")
+    print(f"    filter    cpu {result['cpu_ms']['filter']:7.1f} ms")
+    top = sorted(result["allocated_bytes"].items(), key=lambda item: -item[1])[:5]
+    if top:
+        print("    allocated " + ", ".join(f"{name} {size / 1024:.1f} KiB" for name, size in top))
+
+
+def int_list(text):
+    return [int(value) for value in text.split(",")]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the weight display pipeline on simulated devices")
+    parser.add_argument("--duration", type=float, default=3.0, help="seconds per run")
+    parser.add_argument("--rate", type=int, default=80, help="simulated HX711 samples/s (10 or 80)")
+    parser.add_argument("--noise", type=float, default=0.5, help="simulated noise in grams")
+    parser.add_argument("--filter", default="spike+median", help="filter name, see filters.FILTERS")
+    parser.add_argument("--pixels", type=int_list, default=[30], help="comma separated pixel counts")
+    parser.add_argument("--window", type=int_list, default=[5], help="comma separated filter windows")
+    parser.add_argument("--font-size", type=int_list, default=[28], help="comma separated font sizes")
+    parser.add_argument("--oled-fps", type=float, default=10)
+    parser.add_argument("--pixel-fps", type=float, default=60)
+    parser.add_argument("--allocations", action="store_true", help="trace allocations (slower)")
+    parser.add_argument("--json", metavar="PATH", help="write results as JSON ('-' for stdout)")
+    args = parser.parse_args(argv)
+
+    results = []
+    for num_pixels, window, font_size in itertools.product(args.pixels, args.window, args.font_size):
+        result = run_once(num_pixels, window, font_size, args)
+        results.append(result)
+        if args.json != "-":
+            print_result(result)
+
+    if args.json == "-":
+        json.dump(results, sys.stdout, indent=2)
+        print()
+    elif args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+import math
+import time
+from abc import ABC, abstractmethod
+from array import array
+
+# ┌──── Tare & Calibration Jobs ────┐
+# Tare and calibration watch the sampler's existing sample stream instead of
+# stopping it to take their own readings. A job keeps the newest `window` raw
+# counts and finishes as soon as their spread drops below `max_std` grams,
+# i.e. as soon as the scale has settled, rather than after a fixed number of
+# samples or a fixed delay. Call poll() from the main loop; it never blocks.
+#
+# The channel jobs do the same for one cell of a multi_scale.MultiScale bank,
+# watching that channel's column of the bank's raw ring buffer; one job per
+# channel tares a whole bank.
+
+
+class StableReadingJob(ABC):
+    """Wait for `window` consecutive samples with a small spread, then finish()"""
+
+    name = "Scale"                    # what the timeout message calls the sensor
+
+    def __init__(self, sampler, window=8, max_std=1.0, timeout=5.0):
+        self.sampler = sampler
+        self.window = window
+        self.max_std = max_std        # grams
+        self.timeout = timeout        # seconds
+        self.values = array("d", [0.0]) * window
+        self.seen = 0
+        self.total = 0.0
+        self.total_sq = 0.0
+        self.next_sample = sampler.count  # only samples taken after the job started
+        self.started = time.monotonic()
+        self.done = False
+        self.settled = False          # True once finish() ran on a stable window
+        self.message = ""
+        sampler.wake()  # a duty-cycled sampler would take ages to fill the window
+
+    def poll(self):
+        """Consume new samples; returns True once the job has finished"""
+        if self.done:
+            return True
+        sampler = self.sampler
+        count = sampler.count
+        # If the job fell more than a buffer behind, skip to what is still buffered
+        self.next_sample = max(self.next_sample, count - sampler.size)
+        while self.next_sample < count:
+            self._add(self._raw(self.next_sample % sampler.size))
+            self.next_sample += 1
+            if self.seen >= self.window and self._std_grams() <= self.max_std:
+                self.settled = True
+                self.finish(self.total / self.window)
+                self.done = True
+                return True
+        if self.timeout is not None and time.monotonic() - self.started > self.timeout:
+            self.message = f"{self.name} did not settle, try again"
+            self.done = True
+        return self.done
+
+    def restart(self):
+        """Start collecting a fresh window"""
+        self.seen = 0
+        self.total = 0.0
+        self.total_sq = 0.0
+        self.started = time.monotonic()
+        self.done = False
+        self.settled = False
+
+    def _add(self, value):
+        # Sliding sum and sum of squares over the window
+        slot = self.seen % self.window
+        if self.seen >= self.window:
+            old = self.values[slot]
+            self.total -= old
+            self.total_sq -= old * old
+        self.values[slot] = value
+        self.total += value
+        self.total_sq += value * value
+        self.seen += 1
+
+    def _std_grams(self):
+        mean = self.total / self.window
+        variance = max(0.0, self.total_sq / self.window - mean * mean)
+        return math.sqrt(variance) / abs(self._reference_unit())
+
+    @abstractmethod
+    def finish(self, mean_raw):
+        """Act on the mean raw count of the stable window"""
+
+    # ── Sampler access, overridden by the channel jobs ──
+    def _raw(self, slot):
+        return float(self.sampler.raw[slot])
+
+    def _reference_unit(self):
+        return self.sampler.hx.get_reference_unit()
+
+
+class TareJob(StableReadingJob):
+    """Zero the scale once the empty reading is stable"""
+
+    def finish(self, mean_raw):
+        self.sampler.set_offset(mean_raw)
+        self.message = f"Tared in {time.monotonic() - self.started:.2f} s"
+
+
+class CalibrationJob(StableReadingJob):
+    """Set the reference unit once the reading with a known weight is stable"""
+
+    def __init__(self, sampler, known_weight, **options):
+        if known_weight <= 0:
+            raise ValueError("Known weight must be more than 0 g")
+        super().__init__(sampler, **options)
+        self.known_weight = known_weight
+        self.reference_unit = None
+
+    def finish(self, mean_raw):
+        counts = mean_raw - self.sampler.hx.get_offset()
+        if abs(counts) < 1:  # less than one ADC count: nothing on the scale
+            self.message = "No load detected. Calibration cancelled."
+            return
+        self.reference_unit = counts / self.known_weight
+        self.sampler.set_reference_unit(self.reference_unit)
+        self.message = f"Calibrated! New reference unit: {self.reference_unit:.2f}"
+
+
+class ChannelJob(StableReadingJob):
+    """StableReadingJob on one channel of a multi_scale.MultiScale"""
+
+    def __init__(self, scale, channel, **options):
+        self.channel = channel
+        self.name = f"Channel {channel}"
+        super().__init__(scale, **options)
+
+    def _raw(self, slot):
+        return float(self.sampler.raw[slot, self.channel])
+
+    def _reference_unit(self):
+        return self.sampler.reference_units[self.channel]
+
+
+class ChannelTareJob(ChannelJob):
+    """Zero one channel once its empty reading is stable"""
+
+    def finish(self, mean_raw):
+        self.sampler.set_offset(self.channel, mean_raw)
+        self.message = f"{self.name} tared"
+
+
+class ChannelCalibrationJob(ChannelJob):
+    """Set one channel's reference unit once its reading with a known weight is stable"""
+
+    def __init__(self, scale, channel, known_weight, **options):
+        if known_weight <= 0:
+            raise ValueError("Known weight must be more than 0 g")
+        super().__init__(scale, channel, **options)
+        self.known_weight = known_weight
+        self.reference_unit = None
+
+    def finish(self, mean_raw):
+        counts = mean_raw - self.sampler.offsets[self.channel]
+        if abs(counts) < 1:
+            self.message = f"No load detected on channel {self.channel}. Calibration cancelled."
+            return
+        self.reference_unit = counts / self.known_weight
+        self.sampler.set_reference_unit(self.channel, self.reference_unit)
+        self.message = f"Calibrated channel {self.channel}! New reference unit: {self.reference_unit:.2f}"
+
+
+class ZeroTracker(StableReadingJob):
+    """Automatic zero tracking: slowly pull an empty scale's reading back to zero
+
+    The first stable reading after start-up is zeroed outright if it lies
+    within `capture_band` grams (the power-up zero). After that only stable
+    readings within `band` grams of zero count as an empty scale, and the
+    zero follows them by at most `max_rate` grams per second, so a load put
+    on the scale is never tared away. poll() runs forever and returns True
+    when the zero was captured or has moved another `report_step` grams.
+    """
+
+    def __init__(self, sampler, band=0.5, capture_band=2.0, max_rate=0.05, report_step=0.3, window=16, max_std=0.5):
+        super().__init__(sampler, window=window, max_std=max_std, timeout=None)
+        self.band = band
+        self.capture_band = capture_band
+        self.max_rate = max_rate      # grams per second
+        self.report_step = report_step
+        self.captured = False
+        self.moved = 0.0              # grams tracked since the last report
+        self.last_zero = None         # when the scale last read zero; None while loaded
+        self.corrections = 0
+        self.corrected = False
+
+    def poll(self):
+        self.corrected = False
+        if super().poll():
+            self.restart()
+        return self.corrected
+
+    def finish(self, mean_raw):
+        hx = self.sampler.hx
+        drift = (mean_raw - hx.get_offset()) / hx.get_reference_unit()
+        now = time.monotonic()
+        if not self.captured:
+            self.captured = True
+            if abs(drift) <= self.capture_band:
+                self.sampler.set_offset(mean_raw)
+                self.last_zero = now
+                self._report(f"Zero captured ({drift:+.2f} g)")
+            return
+        if abs(drift) > self.band:
+            self.last_zero = None  # loaded: track again only after it has read zero
+            return
+        if self.last_zero is None:
+            self.last_zero = now
+            return
+        limit = self.max_rate * (now - self.last_zero)
+        step = max(-limit, min(limit, drift))
+        self.last_zero = now
+        # Small steps keep the filter running so the reading does not jump
+        self.sampler.set_offset(hx.get_offset() + step * hx.get_reference_unit(), reset_filter=False)
+        self.moved += step
+        if abs(self.moved) >= self.report_step:
+            self._report(f"Zero tracked {self.moved:+.2f} g")
+            self.moved = 0.0
+
+    def _report(self, message):
+        self.corrections += 1
+        self.corrected = True
+        self.message = message
@@ -0,0 +1,105 @@
+import json
+import os
+import tempfile
+import time
+import devices
+
+# ┌──── Calibration Store ────┐
+# Reference unit and zero offset per load-cell channel, kept
+# in a small JSON file so a scale can report real weights right after boot
+# instead of re-taring and re-calibrating. Writes go to a temporary file
+# in the same directory which then replaces the old file, so a power cut
+# mid-write leaves either the old or the new calibration, never half of one.
+# Each device backend has its own file, so a RASPI_BACKEND=sim run can never
+# hand its simulated offset to a real scale.
+#
+# {
+#   "hx711": {"reference_unit": 210.0, "offset": 8123.4, "saved_at": 1700000000.0}
+# }
+
+DEFAULT_PATH = os.path.join(os.path.expanduser("~"), ".config", "raspi-scale", "calibration.json")
+FIELDS = ("reference_unit", "offset")
+
+
+def default_path(backend=None):
+    """Calibration file for a device backend: calibration.json on hardware, calibration-sim.json etc."""
+    backend = backend or devices.BACKEND
+    if backend == "hardware":
+        return DEFAULT_PATH
+    return os.path.join(os.path.dirname(DEFAULT_PATH), f"calibration-{backend}.json")
+
+
+class CalibrationStore:
+    """Per-channel calibration persisted to a JSON file"""
+
+    def __init__(self, path=None):
+        self.path = path or default_path()
+        self.channels = {}
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.path) as f:
+                self.channels = json.load(f)
+        except (OSError, ValueError):
+            self.channels = {}  # first run, or an unreadable file: start uncalibrated
+        return self
+
+    def get(self, channel="hx711"):
+        """Stored values for a channel, or None if it was never calibrated"""
+        return self.channels.get(channel)
+
+    def save(self, channel="hx711", **values):
+        """Update some fields of a channel and write the file atomically"""
+        self._update(channel, values)
+        self._write()
+
+    def _update(self, channel, values):
+        entry = self.channels.setdefault(channel, {})
+        entry.update({k: float(v) for k, v in values.items() if k in FIELDS})
+        entry["saved_at"] = time.time()
+
+    def _write(self):
+        directory = os.path.dirname(self.path) or "."
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".calibration-")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(self.channels, f, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    # ── Single HX711 ──
+    def apply(self, hx, channel="hx711"):
+        """Load reference unit and offset into an HX711; False if none are stored"""
+        entry = self.get(channel)
+        if not entry or "reference_unit" not in entry or "offset" not in entry:
+            return False
+        hx.set_reference_unit(entry["reference_unit"])
+        hx.set_offset(entry["offset"])
+        return True
+
+    def save_hx711(self, hx, channel="hx711"):
+        self.save(channel, reference_unit=hx.get_reference_unit(), offset=hx.get_offset())
+
+    # ── multi_scale.MultiScale ──
+    def apply_scale(self, scale, prefix="channel"):
+        """Load every channel of a MultiScale; returns the channels that had no calibration"""
+        missing = []
+        for i in range(scale.channels):
+            entry = self.get(f"{prefix}{i}")
+            if entry and "offset" in entry:
+                scale.offsets[i] = entry["offset"]
+                scale.reference_units[i] = entry.get("reference_unit", scale.reference_units[i])
+            else:
+                missing.append(i)
+        return missing
+
+    def save_scale(self, scale, prefix="channel", channels=None):
+        for i in range(scale.channels) if channels is None else channels:
+            self._update(f"{prefix}{i}", {"reference_unit": scale.reference_units[i], "offset": scale.offsets[i]})
+        self._write()
@@ -0,0 +1,93 @@
+import time
+
+# ┌──── Change Detector ────┐
+# Sits between the filtered weight and the outputs and decides which readings
+# are worth drawing. The reported value only moves when a reading leaves a
+# deadband around it, so sensor noise never reaches the displays. Stability
+# uses hysteresis: the weight counts as stable once readings stay within
+# `settle_band` of their mean for `settle_time` seconds, and only becomes
+# unstable again when a reading leaves the wider `unsettle_band`. While
+# stable the value is held at the mean of the settled readings; a smaller
+# change that settles for `settle_time` at more than `deadband` from it
+# moves the value without the weight ever counting as unstable.
+#
+# update() is cheap enough to run on the acquisition thread for every sample.
+# Subscribers are called there too, so they should only wake other threads
+# (e.g. RenderScheduler.notify) rather than do I/O themselves.
+
+CHANGE = "change"
+STABLE = "stable"
+UNSTABLE = "unstable"
+
+
+class ChangeDetector:
+    """Deadband and stable/unstable events for a stream of weights"""
+
+    def __init__(self, deadband=1.0, settle_band=1.0, unsettle_band=3.0, settle_time=1.0):
+        self.deadband = deadband              # grams the value must move to be reported
+        self.settle_band = settle_band        # grams readings may wander while settling
+        self.unsettle_band = unsettle_band    # grams that end a stable period
+        self.settle_time = settle_time        # seconds within settle_band to become stable
+        self.value = 0.0                      # reported weight
+        self.stable = False
+        self.state = (0.0, False)             # (value, stable), replaced as one object
+        self.subscribers = []                 # callback(event, detector)
+        self.updates = 0                      # readings seen
+        self.events = {CHANGE: 0, STABLE: 0, UNSTABLE: 0}
+        self._quiet_since = None              # start of the current quiet period
+        self._sum = 0.0                       # readings in the current quiet period
+        self._n = 0
+
+    def subscribe(self, callback):
+        self.subscribers.append(callback)
+        return callback
+
+    def update(self, weight, t=None):
+        """Feed one filtered weight; returns the event it caused, or None"""
+        t = time.monotonic() if t is None else t
+        self.updates += 1
+        if self._quiet_since is None:
+            self._settle_from(weight, t)
+            return self._emit(CHANGE, weight, False)
+        if self.stable:
+            if abs(weight - self.value) > self.unsettle_band:
+                self._settle_from(weight, t)
+                return self._emit(UNSTABLE, weight, False)
+            if abs(weight - self._sum / self._n) > self.settle_band:
+                self._settle_from(weight, t)  # a new quiet period starts away from the held value
+                return None
+            self._sum += weight
+            self._n += 1
+            mean = self._sum / self._n
+            if t - self._quiet_since >= self.settle_time and abs(mean - self.value) > self.deadband:
+                return self._emit(CHANGE, mean, True)
+            return None
+        if abs(weight - self._sum / self._n) > self.settle_band:
+            self._settle_from(weight, t)
+        else:
+            self._sum += weight
+            self._n += 1
+            if t - self._quiet_since >= self.settle_time:
+                return self._emit(STABLE, self._sum / self._n, True)
+        if abs(weight - self.value) > self.deadband:
+            return self._emit(CHANGE, weight, False)
+        return None
+
+    def reset(self):
+        """Forget the current value, e.g. after a tare"""
+        self._quiet_since = None
+        self.stable = False
+
+    def _settle_from(self, weight, t):
+        self._quiet_since = t
+        self._sum = weight
+        self._n = 1
+
+    def _emit(self, event, value, stable):
+        self.value = value
+        self.stable = stable
+        self.state = (value, stable)
+        self.events[event] += 1
+        for callback in self.subscribers:
+            callback(event, self)
+        return event
@@ -0,0 +1,96 @@
+import os
+
+# ┌──── Device Backends ────┐
+# Scripts open their hardware through these functions instead of importing
+# board/neopixel/hx711/luma/RPi.GPIO directly. The backend is "hardware" on a
+# Pi, or "sim" for the deterministic simulators in sim_devices.py:
+#
+#   RASPI_BACKEND=sim python3 weight_display_demo.py
+#
+# Hardware libraries are only imported when a hardware device is opened.
+
+BACKENDS = ("hardware", "sim")
+BACKEND = os.environ.get("RASPI_BACKEND", "hardware")
+
+
+def _backend(backend):
+    backend = backend or BACKEND
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown device backend '{backend}', choose from: {', '.join(BACKENDS)}")
+    return backend
+
+
+def open_hx711(dout=6, sck=5, backend=None, **sim_options):
+    """HX711 load cell amplifier on DOUT/SCK (BCM numbering)"""
+    if _backend(backend) == "sim":
+        from sim_devices import SimHX711
+        return SimHX711(**sim_options)
+    from hx711 import HX711
+    return HX711(dout, sck)
+
+
+def open_scale_bank(dout_pins=(6,), sck_pin=5, backend=None, **sim_options):
+    """Several HX711 boards sharing one SCK line, for multi_scale.MultiScale"""
+    if _backend(backend) == "sim":
+        from sim_devices import SimHX711
+        from multi_scale import InterleavedHX711
+        seed = sim_options.pop("seed", 0)
+        return InterleavedHX711(SimHX711(seed=seed + i, **sim_options) for i in range(len(dout_pins)))
+    from multi_scale import SharedClockHX711
+    return SharedClockHX711(dout_pins, sck_pin)
+
+
+def open_oled(port=1, address=0x3C, width=128, height=128, rotate=2, backend=None):
+    """SH1107 OLED on I2C through luma.oled"""
+    if _backend(backend) == "sim":
+        from sim_devices import SimOLED
+        return SimOLED(width, height, rotate)
+    from luma.core.interface.serial import i2c
+    from luma.oled.device import sh1107
+    serial = i2c(port=port, address=address)
+    return sh1107(serial, width=width, height=height, rotate=rotate)
+
+
+def open_grove_oled(bus=1, address=0x3C, width=128, height=128, rotate=0, backend=None):
+    """Seeed Grove SH1107G OLED on I2C through smbus2 (no grove.py needed)"""
+    if _backend(backend) == "sim":
+        from sim_devices import SimOLED
+        return SimOLED(width, height, rotate)
+    from grove_sh1107 import GroveSH1107
+    return GroveSH1107(bus, address, width, height, rotate)
+
+
+def open_pixels(num_pixels=30, pin="D18", brightness=1.0, order="GRB", backend=None):
+    """NeoPixel strip; `pin` is a board pin name such as "D18"
+
+    Leave `brightness` at 1.0 when frames go through pixel_engine, which
+    applies brightness in its lookup tables instead of per write.
+    """
+    if _backend(backend) == "sim":
+        from sim_devices import SimPixels
+        return SimPixels(num_pixels, brightness, bpp=len(order))
+    import board
+    import neopixel
+    return neopixel.NeoPixel(
+        getattr(board, pin), num_pixels, brightness=brightness, auto_write=False,
+        pixel_order=getattr(neopixel, order),
+    )
+
+
+def open_buzzer(pin=12, frequency=440, backend=None):
+    """PWM channel driving a passive buzzer"""
+    if _backend(backend) == "sim":
+        from sim_devices import SimPWM
+        return SimPWM(pin, frequency)
+    import RPi.GPIO as GPIO
+    GPIO.setwarnings(False)
+    GPIO.setmode(GPIO.BCM)
+    GPIO.setup(pin, GPIO.OUT)
+    return GPIO.PWM(pin, frequency)
+
+
+def cleanup_gpio(backend=None):
+    """Release GPIO pins claimed by open_buzzer()"""
+    if _backend(backend) == "hardware":
+        import RPi.GPIO as GPIO
+        GPIO.cleanup()
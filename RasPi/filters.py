@@ -0,0 +1,180 @@
+import math
+from array import array
+from bisect import bisect_left, insort
+
+# ┌──── Streaming Weight Filters ────┐
+# Every filter takes one sample at a time through update(value, t=None) and
+# returns the current filtered value. Windows are preallocated when the filter
+# is built, so the per-sample path does no list building or allocation.
+# Pick a filter by name with make_filter("median", window=7).
+
+
+class RunningMean:
+    """Moving average over the last `window` samples in O(1)"""
+
+    def __init__(self, window=5):
+        self.window = window
+        self.values = array("d", [0.0]) * window
+        self.reset()
+
+    def reset(self):
+        self.count = 0
+        self.total = 0.0
+
+    def update(self, value, t=None):
+        slot = self.count % self.window
+        if self.count >= self.window:
+            self.total -= self.values[slot]
+        self.values[slot] = value
+        self.total += value
+        self.count += 1
+        return self.total / min(self.count, self.window)
+
+
+class MedianFilter:
+    """Median of the last `window` samples, kept in a sorted window"""
+
+    def __init__(self, window=5):
+        self.window = window
+        self.values = array("d", [0.0]) * window
+        self.sorted = []
+        self.reset()
+
+    def reset(self):
+        self.count = 0
+        self.sorted.clear()
+
+    def update(self, value, t=None):
+        slot = self.count % self.window
+        if self.count >= self.window:
+            # Drop the oldest sample from the sorted window before adding the new one
+            del self.sorted[bisect_left(self.sorted, self.values[slot])]
+        self.values[slot] = value
+        insort(self.sorted, value)
+        self.count += 1
+        n = len(self.sorted)
+        mid = n // 2
+        if n % 2:
+            return self.sorted[mid]
+        return (self.sorted[mid - 1] + self.sorted[mid]) / 2
+
+
+class ExponentialFilter:
+    """Exponential moving average; higher alpha follows changes faster"""
+
+    def __init__(self, alpha=0.3):
+        self.alpha = alpha
+        self.reset()
+
+    def reset(self):
+        self.value = None
+
+    def update(self, value, t=None):
+        if self.value is None:
+            self.value = value
+        else:
+            self.value += self.alpha * (value - self.value)
+        return self.value
+
+
+class OneEuroFilter:
+    """One-euro filter: heavy smoothing at rest, little lag while the weight moves"""
+
+    def __init__(self, min_cutoff=1.0, beta=0.05, d_cutoff=1.0, rate=10.0):
+        self.min_cutoff = min_cutoff   # Hz, smoothing when the signal is steady
+        self.beta = beta               # how quickly the cutoff opens up with speed
+        self.d_cutoff = d_cutoff       # Hz, smoothing of the speed estimate
+        self.rate = rate               # assumed samples/s when no timestamps are given
+        self.reset()
+
+    def reset(self):
+        self.value = None
+        self.speed = 0.0
+        self.last_t = None
+
+    @staticmethod
+    def _alpha(cutoff, dt):
+        tau = 1.0 / (2 * math.pi * cutoff)
+        return 1.0 / (1.0 + tau / dt)
+
+    def update(self, value, t=None):
+        if self.value is None:
+            self.value = value
+            self.last_t = t
+            return value
+        if t is None or self.last_t is None or t <= self.last_t:
+            dt = 1.0 / self.rate
+        else:
+            dt = t - self.last_t
+        self.last_t = t
+        speed = (value - self.value) / dt
+        self.speed += self._alpha(self.d_cutoff, dt) * (speed - self.speed)
+        cutoff = self.min_cutoff + self.beta * abs(self.speed)
+        self.value += self._alpha(cutoff, dt) * (value - self.value)
+        return self.value
+
+
+class SpikeRejector:
+    """Drop isolated samples that jump more than `threshold` from the last good one
+
+    A real load change keeps its new level, so after `max_rejects` consecutive
+    outliers the new level is accepted.
+    """
+
+    def __init__(self, threshold=50.0, max_rejects=2):
+        self.threshold = threshold
+        self.max_rejects = max_rejects
+        self.reset()
+
+    def reset(self):
+        self.value = None
+        self.rejected = 0
+
+    def update(self, value, t=None):
+        if self.value is None or abs(value - self.value) <= self.threshold or self.rejected >= self.max_rejects:
+            self.value = value
+            self.rejected = 0
+        else:
+            self.rejected += 1
+        return self.value
+
+
+class FilterChain:
+    """Run several filters in series, e.g. spike rejection then median"""
+
+    def __init__(self, *filters):
+        self.filters = filters
+
+    def reset(self):
+        for f in self.filters:
+            f.reset()
+
+    def update(self, value, t=None):
+        for f in self.filters:
+            value = f.update(value, t)
+        return value
+
+
+FILTERS = {
+    "mean": RunningMean,
+    "median": MedianFilter,
+    "ema": ExponentialFilter,
+    "one_euro": OneEuroFilter,
+    "spike": SpikeRejector,
+}
+
+
+def make_filter(name, **options):
+    """Build a filter by name; "spike+median" chains filters left to right
+
+    Options are handed to every filter in the chain that accepts them.
+    """
+    stages = []
+    for stage in name.split("+"):
+        stage = stage.strip()
+        if stage not in FILTERS:
+            raise ValueError(f"Unknown filter '{stage}', choose from: {', '.join(FILTERS)}")
+        cls = FILTERS[stage]
+        accepted = cls.__init__.__code__.co_varnames[1:cls.__init__.__code__.co_argcount]
+        stages.append(cls(**{k: v for k, v in options.items() if k in accepted}))
+    return stages[0] if len(stages) == 1 else FilterChain(*stages)
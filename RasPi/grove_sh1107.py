@@ -0,0 +1,103 @@
+from instrument import span
+from oled_renderer import pack_pages, rotate_frame
+
+# ┌──── Grove SH1107 Driver ────┐
+# Direct smbus2 driver for the Seeed Grove 1.12" 128x128 OLED (SH1107G),
+# replacing grove.factory's setCursor()/write(), which sends a few bytes per
+# I2C transaction for every character. It offers the same device interface
+# as luma.oled (size, preprocess, command, data, display, cleanup), so
+# oled_renderer.WeightRenderer draws on it unchanged: frames are composed in
+# memory and only the changed column span of each changed page is sent.
+#
+# data() sends a whole span as one I2C write (control byte 0x40, then up to
+# 128 bytes) through i2c_rdwr; buses without it fall back to 32-byte SMBus
+# block writes. A full 128x128 frame is 16 page writes instead of thousands.
+
+CONTROL_COMMAND = 0x00
+CONTROL_DATA = 0x40
+BLOCK_SIZE = 32  # Largest SMBus block write
+
+# Same power-on sequence as grove.py's SH1107G driver
+INIT_SEQUENCE = (
+    0xAE,        # Display off
+    0xDC, 0x00,  # Display start line 0
+    0x81, 0x2F,  # Contrast
+    0x20,        # Page addressing mode
+    0xA0,        # Segment remap: normal
+    0xC0,        # COM scan direction: normal
+    0xA8, 0x7F,  # Multiplex ratio: 128 rows
+    0xD3, 0x60,  # Display offset used by the Grove board
+    0xD5, 0x51,  # Clock divide / oscillator
+    0xD9, 0x22,  # Pre-charge period
+    0xDB, 0x35,  # VCOMH deselect level
+    0xA4,        # Show RAM contents
+    0xA6,        # Normal (not inverted)
+)
+
+
+class GroveSH1107:
+    """Seeed Grove SH1107G on I2C through smbus2, with a luma-style interface"""
+
+    def __init__(self, bus=1, address=0x3C, width=128, height=128, rotate=0):
+        from smbus2 import SMBus, i2c_msg
+        self.bus = SMBus(bus)
+        self.address = address
+        self.width = width
+        self.height = height
+        self.size = (width, height)
+        self.mode = "1"
+        self.rotate = rotate
+        self._i2c_msg = i2c_msg
+        self._bulk = True            # cleared if the adapter rejects combined transfers
+        self.bytes_written = 0
+        self.transactions = 0
+        self.command(*INIT_SEQUENCE)
+        self.clear()
+        self.command(0xAF)           # Display on
+
+    def preprocess(self, image):
+        return rotate_frame(image, self.rotate, self.size)
+
+    # ── Transfers ──
+    def command(self, *cmd):
+        for i in range(0, len(cmd), BLOCK_SIZE):
+            self.bus.write_i2c_block_data(self.address, CONTROL_COMMAND, list(cmd[i:i + BLOCK_SIZE]))
+            self.transactions += 1
+
+    def data(self, data):
+        """Write display RAM from the current page and column in as few transfers as possible"""
+        data = bytes(data)
+        with span("grove_oled.write"):
+            if self._bulk:
+                try:
+                    self.bus.i2c_rdwr(self._i2c_msg.write(self.address, bytes((CONTROL_DATA,)) + data))
+                    self.transactions += 1
+                    self.bytes_written += len(data)
+                    return
+                except OSError:
+                    self._bulk = False
+            # The column address advances after every byte, so chunks continue where the last ended
+            for i in range(0, len(data), BLOCK_SIZE):
+                self.bus.write_i2c_block_data(self.address, CONTROL_DATA, list(data[i:i + BLOCK_SIZE]))
+                self.transactions += 1
+            self.bytes_written += len(data)
+
+    # ── Frames ──
+    def display(self, image):
+        """Full-frame transfer, as luma's display() does"""
+        for page, data in enumerate(pack_pages(self.preprocess(image))):
+            self.command(0xB0 | page, 0x00, 0x10)
+            self.data(data)
+
+    def clear(self):
+        for page in range(self.height // 8):
+            self.command(0xB0 | page, 0x00, 0x10)
+            self.data(bytes(self.width))
+
+    def contrast(self, level):
+        self.command(0x81, level)
+
+    def cleanup(self):
+        self.clear()
+        self.command(0xAE)
+        self.bus.close()
@@ -0,0 +1,225 @@
+import threading
+import time
+from array import array
+from filters import RunningMean
+from instrument import span, count
+
+# ┌──── HX711 Background Sampler ────┐
+# One acquisition thread clocks the HX711 as fast as the chip converts
+# (10 or 80 SPS depending on the RATE pin) and writes every reading into a
+# fixed-size, preallocated ring buffer. The thread is the only writer: it
+# fills a slot first and then advances `count`, so readers can look at the
+# newest slots at any time without taking a lock or stalling acquisition.
+# Listeners (e.g. change_detector.ChangeDetector.update) see every filtered
+# sample on this thread and must return quickly.
+#
+# With a PowerPolicy the chip keeps streaming while the weight changes and
+# is only duty-cycled (power down, sleep, power up) after a quiet period.
+# Activity is judged on the raw weight, before the filter chain, so the
+# first reading of a duty cycle that moves past wake_threshold resumes
+# continuous streaming.
+#
+# Readings taken while the chip settles are discarded: `settle_samples` when
+# the thread starts (callers reset or power up the chip first), with or
+# without a policy, and the policy's count after every power-up.
+
+
+class PowerPolicy:
+    """When to keep the HX711 streaming and when to duty-cycle it"""
+
+    def __init__(self, idle_timeout=30.0, sleep_period=1.0, settle_samples=4, wake_samples=2, wake_threshold=2.0):
+        self.idle_timeout = idle_timeout       # seconds without change before duty-cycling
+        self.sleep_period = sleep_period       # seconds powered down per cycle
+        self.settle_samples = settle_samples   # readings dropped after each power-up
+        self.wake_samples = wake_samples       # valid readings taken per cycle
+        self.wake_threshold = wake_threshold   # grams of change that count as activity
+
+
+class HX711Sampler:
+    """Continuously sample an HX711 into a timestamped ring buffer"""
+
+    def __init__(self, hx, size=256, weight_filter=None, power_policy=None, settle_samples=4):
+        self.hx = hx
+        self.power_policy = power_policy           # None = always powered
+        self.settle_samples = settle_samples       # readings dropped when sampling starts
+        self.size = size
+        self.filter = weight_filter or RunningMean(5)  # any filters.py filter
+        self.times = array("d", [0.0]) * size      # time.monotonic() per sample
+        self.raw = array("q", [0]) * size          # raw 24-bit ADC counts
+        self.weights = array("d", [0.0]) * size    # (raw - offset) / reference unit
+        self.filtered_weights = array("d", [0.0]) * size  # filter output per sample
+        self.count = 0                             # total samples written so far
+        self.filtered = 0.0                        # latest filtered weight
+        self.listeners = []                        # callback(filtered, timestamp) per sample
+        self.lock = threading.Lock()               # guards the HX711 GPIO lines
+        self.discarded = 0                         # settling readings thrown away
+        self.sleeps = 0                            # duty-cycle power-downs
+        self._powered_time = 0.0
+        self._powered_since = None                 # None while powered down
+        self._last_activity = 0.0
+        self._activity_weight = 0.0
+        self._since_wake = 0
+        self._reset_filter = False
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._thread = None
+
+    # ── Lifecycle ──
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="hx711-sampler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+            self._thread = None
+
+    def _run(self):
+        hx = self.hx
+        policy = self.power_policy
+        self._powered_since = self._last_activity = time.monotonic()
+        self._settle(self.settle_samples)  # the chip was just reset or powered up by the caller
+        while not self._stop.is_set():
+            if policy is not None and self._idle(policy):
+                self._duty_cycle(policy)
+                continue
+            if not self._wait_ready():
+                break
+            with self.lock, span("hx711.read"):
+                raw = hx.read_long()
+                weight = (raw - hx.get_offset()) / hx.get_reference_unit()
+            now = time.monotonic()
+            if policy is not None:
+                self._activity(policy, weight, now)
+            self._push(now, raw, weight)
+            self._since_wake += 1
+        if self._powered_since is not None:
+            self._powered_time += time.monotonic() - self._powered_since
+            self._powered_since = None
+
+    def _wait_ready(self):
+        # read_long() busy-waits for DOUT while holding the lock and the GIL;
+        # poll here instead so other threads run until the conversion is done
+        while not self.hx.is_ready():
+            if self._stop.wait(0.001):
+                return False
+        return True
+
+    # ── Power management ──
+    def _activity(self, policy, weight, now):
+        if abs(weight - self._activity_weight) > policy.wake_threshold:
+            self._activity_weight = weight
+            self._last_activity = now
+
+    def _idle(self, policy):
+        return (time.monotonic() - self._last_activity > policy.idle_timeout
+                and self._since_wake >= policy.wake_samples)
+
+    def _duty_cycle(self, policy):
+        hx = self.hx
+        with self.lock:
+            hx.power_down()
+        self._powered_time += time.monotonic() - self._powered_since
+        self._powered_since = None
+        self.sleeps += 1
+        with span("hx711.sleep"):
+            self._wake.wait(policy.sleep_period)
+        self._wake.clear()
+        if self._stop.is_set():
+            return
+        with self.lock:
+            hx.power_up()
+        self._powered_since = time.monotonic()
+        self._settle(policy.settle_samples)
+
+    def _settle(self, samples):
+        for _ in range(samples):
+            if not self._wait_ready():
+                return
+            with self.lock:
+                self.hx.read_long()
+            self.discarded += 1
+        count("hx711.settling_discarded", samples)
+        self._since_wake = 0
+
+    def wake(self):
+        """Stream continuously again, e.g. for a user action or a tare/calibration job"""
+        self._last_activity = time.monotonic()
+        self._wake.set()
+
+    def powered_time(self):
+        """Seconds the HX711 has been powered while sampling"""
+        if self._powered_since is None:
+            return self._powered_time
+        return self._powered_time + time.monotonic() - self._powered_since
+
+    def power_stats(self):
+        return {"powered_s": self.powered_time(), "discarded": self.discarded, "sleeps": self.sleeps}
+
+    def _push(self, timestamp, raw, weight):
+        if self._reset_filter:
+            # The filter is only touched from this thread; other threads just ask for a reset
+            self._reset_filter = False
+            self.filter.reset()
+        filtered = self.filter.update(weight, timestamp)
+        slot = self.count % self.size
+        self.times[slot] = timestamp
+        self.raw[slot] = raw
+        self.weights[slot] = weight
+        self.filtered_weights[slot] = filtered
+        self.count += 1
+        self.filtered = filtered
+        for listener in self.listeners:
+            listener(self.filtered, timestamp)
+
+    # ── Non-blocking readers ──
+    def latest_weight(self):
+        """Latest filtered weight; never waits for the ADC"""
+        return self.filtered
+
+    def latest(self):
+        """Newest (timestamp, raw, weight) sample, or None before the first read"""
+        if self.count == 0:
+            return None
+        slot = (self.count - 1) % self.size
+        return self.times[slot], self.raw[slot], self.weights[slot]
+
+    def rate(self):
+        """Measured samples per second over the buffered history"""
+        count = self.count
+        span = min(count, self.size)
+        if span < 2:
+            return 0.0
+        newest = self.times[(count - 1) % self.size]
+        oldest = self.times[(count - span) % self.size]
+        return (span - 1) / (newest - oldest) if newest > oldest else 0.0
+
+    def wait_samples(self, samples, timeout=None):
+        """Block the caller (not the sampler) until `samples` new readings arrive"""
+        target = self.count + samples
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self.count < target:
+            if deadline is not None and time.monotonic() > deadline:
+                return False
+            time.sleep(0.005)
+        return True
+
+    # ── Exclusive HX711 access ──
+    def reset_filter(self):
+        """Restart filtering, e.g. after the zero point or scale has changed"""
+        self._reset_filter = True
+
+    def set_offset(self, offset, reset_filter=True):
+        with self.lock:
+            self.hx.set_offset(offset)
+        if reset_filter:
+            self.reset_filter()
+
+    def set_reference_unit(self, reference_unit):
+        with self.lock:
+            self.hx.set_reference_unit(reference_unit)
+        self.reset_filter()
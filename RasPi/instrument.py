@@ -0,0 +1,229 @@
+import bisect
+import os
+import sys
+import threading
+import time
+
+# ┌──── Hot-Path Instrumentation ────┐
+# Timing spans and counters for the places where time goes: HX711 reads,
+# renders, I2C/SPI/PWM writes, audio blocks and sleeps.
+#
+#   with instrument.span("oled.flush"):
+#       ...
+#   instrument.observe("buzzer.late", seconds)
+#   instrument.count("sampler.settling")
+#
+# Off unless RASPI_INSTRUMENT=1 (or enable() is called before the spans are
+# first used). While off, span() returns one shared object whose enter and
+# exit do nothing, so an instrumented loop only pays for a function call.
+# While on, every span feeds a histogram with fixed latency buckets; the
+# scripts print summary() at exit, and start_reporting() can also export
+# Prometheus text to a file (RASPI_INSTRUMENT_FILE) and/or serve it on
+# http://localhost:RASPI_INSTRUMENT_PORT/metrics; set RASPI_INSTRUMENT_HOST
+# (e.g. 0.0.0.0) to let a scraper on another machine reach it.
+
+ENABLED = os.environ.get("RASPI_INSTRUMENT", "") not in ("", "0")
+
+# Histogram bucket upper bounds in seconds: 10 us .. 5 s, then +Inf
+BUCKETS = (1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4, 1e-3, 2.5e-3, 5e-3,
+           1e-2, 2.5e-2, 5e-2, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+class Histogram:
+    """Count, sum, max and bucketed distribution of durations in seconds"""
+
+    def __init__(self, name):
+        self.name = name
+        self.buckets = [0] * (len(BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.lock = threading.Lock()
+
+    def observe(self, seconds):
+        index = bisect.bisect_left(BUCKETS, seconds)
+        with self.lock:
+            self.buckets[index] += 1
+            self.count += 1
+            self.total += seconds
+            if seconds > self.max:
+                self.max = seconds
+
+    def quantile(self, q):
+        """Estimate of quantile q, interpolated inside its bucket"""
+        target = q * self.count
+        seen = 0
+        lower = 0.0
+        for upper, n in zip(BUCKETS + (self.max,), self.buckets):
+            if n and seen + n >= target:
+                upper = min(upper, self.max)
+                return min(lower + (upper - lower) * (target - seen) / n, self.max)
+            seen += n
+            lower = upper
+        return self.max
+
+
+class _Span:
+    __slots__ = ("histogram", "started")
+
+    def __init__(self, histogram):
+        self.histogram = histogram
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.observe(time.perf_counter() - self.started)
+        return False
+
+
+class _NoSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NO_SPAN = _NoSpan()
+histograms = {}
+counters = {}
+_lock = threading.Lock()
+
+
+def enable(on=True):
+    global ENABLED
+    ENABLED = on
+
+
+def histogram(name):
+    h = histograms.get(name)
+    if h is None:
+        with _lock:
+            h = histograms.setdefault(name, Histogram(name))
+    return h
+
+
+def span(name):
+    """Context manager timing its body into histogram `name`"""
+    if not ENABLED:
+        return _NO_SPAN
+    return _Span(histogram(name))
+
+
+def observe(name, seconds):
+    if ENABLED:
+        histogram(name).observe(seconds)
+
+
+def count(name, n=1):
+    if ENABLED:
+        with _lock:
+            counters[name] = counters.get(name, 0) + n
+
+
+# ┌──── Reporting ────┐
+def summary():
+    """One line per span: count, mean, p50, p99 and max in milliseconds"""
+    lines = [f"{'span':<24} {'count':>8} {'mean ms':>9} {'p50 ms':>9} {'p99 ms':>9} {'max ms':>9}"]
+    for name in sorted(histograms):
+        h = histograms[name]
+        if h.count:
+            lines.append(f"{name:<24} {h.count:8d} {1000 * h.total / h.count:9.3f} "
+                         f"{1000 * h.quantile(0.5):9.3f} {1000 * h.quantile(0.99):9.3f} {1000 * h.max:9.3f}")
+    for name in sorted(counters):
+        lines.append(f"{name:<24} {counters[name]:8d}")
+    return "\n".join(lines)
+
+
+def _metric(name):
+    return "raspi_" + "".join(c if c.isalnum() else "_" for c in name)
+
+
+def prometheus_text():
+    """All histograms and counters in the Prometheus text exposition format"""
+    lines = []
+    for name in sorted(histograms):
+        h = histograms[name]
+        metric = _metric(name) + "_seconds"
+        lines.append(f"# TYPE {metric} histogram")
+        cumulative = 0
+        for bound, n in zip(BUCKETS, h.buckets):
+            cumulative += n
+            lines.append(f'{metric}_bucket{{le="{bound:g}"}} {cumulative}')
+        lines.append(f'{metric}_bucket{{le="+Inf"}} {h.count}')
+        lines.append(f"{metric}_sum {h.total:.9f}")
+        lines.append(f"{metric}_count {h.count}")
+    for name in sorted(counters):
+        metric = _metric(name) + "_total"
+        lines.append(f"# TYPE {metric} counter")
+        lines.append(f"{metric} {counters[name]}")
+    return "\n".join(lines) + "\n"
+
+
+def write_file(path):
+    """Write prometheus_text() atomically, e.g. for node_exporter's textfile collector"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        f.write(prometheus_text())
+    os.replace(tmp_path, path)
+
+
+def serve(port, host="127.0.0.1"):
+    """Serve /metrics from a background thread; returns the server"""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            body = prometheus_text().encode()
+            self.send_response(200 if self.path == "/metrics" else 404)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass  # keep the terminal UI clean
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    threading.Thread(target=server.serve_forever, name="metrics", daemon=True).start()
+    return server
+
+
+def start_reporting(interval=10.0, stream=None):
+    """Export as configured by RASPI_INSTRUMENT_FILE / RASPI_INSTRUMENT_PORT / RASPI_INSTRUMENT_HOST
+
+    With `stream` (e.g. sys.stderr) summary() is also written there every
+    `interval` seconds. Does nothing while instrumentation is off.
+    """
+    if not ENABLED:
+        return
+    port = os.environ.get("RASPI_INSTRUMENT_PORT")
+    if port:
+        serve(int(port), os.environ.get("RASPI_INSTRUMENT_HOST", "127.0.0.1"))
+    path = os.environ.get("RASPI_INSTRUMENT_FILE")
+    if not path and stream is None:
+        return
+
+    def run():
+        while True:
+            time.sleep(interval)
+            if path:
+                write_file(path)
+            if stream is not None:
+                print(summary(), file=stream, flush=True)
+
+    threading.Thread(target=run, name="instrument-report", daemon=True).start()
+
+
+def report(stream=sys.stdout):
+    """Print the summary (and write the export file) at exit, if enabled"""
+    if not ENABLED:
+        return
+    path = os.environ.get("RASPI_INSTRUMENT_FILE")
+    if path:
+        write_file(path)
+    print(summary(), file=stream)
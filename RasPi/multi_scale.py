@@ -0,0 +1,243 @@
+import threading
+import time
+import numpy as np
+from filters import make_filter
+from instrument import span
+
+# ┌──── Multi-Channel Load Cells ────┐
+# Several HX711 boards on one Pi, read as one bank per tick:
+#
+#   SharedClockHX711  - all boards share one SCK pin and have their own DOUT.
+#                       One 24-pulse read clocks every board at once, so a
+#                       tick costs the same as reading a single board.
+#   InterleavedHX711  - boards with their own SCK (hx711 library objects or
+#                       simulators). The chips convert in parallel; each tick
+#                       reads every board once it is ready, so the cost per
+#                       extra channel is the bit-banging only, not another
+#                       conversion period.
+#
+# MultiScale samples a bank on a background thread and keeps per-channel
+# offsets and reference units, giving a weight array per tick plus a total.
+# Listeners see the total of every tick, as with HX711Sampler.
+
+
+class SharedClockHX711:
+    """HX711 boards sharing one clock line, read in lockstep"""
+
+    def __init__(self, dout_pins, sck_pin, gain_pulses=1):
+        import RPi.GPIO as GPIO
+        self.GPIO = GPIO
+        self.dout_pins = list(dout_pins)
+        self.sck_pin = sck_pin
+        self.channels = len(self.dout_pins)
+        self.gain_pulses = gain_pulses     # 1 = channel A, gain 128
+        self._values = [0] * self.channels
+        GPIO.setwarnings(False)
+        GPIO.setmode(GPIO.BCM)
+        GPIO.setup(sck_pin, GPIO.OUT)
+        GPIO.output(sck_pin, False)
+        for pin in self.dout_pins:
+            GPIO.setup(pin, GPIO.IN)
+
+    def is_ready(self):
+        # Every board pulls DOUT low when its conversion is ready
+        return not any(self.GPIO.input(pin) for pin in self.dout_pins)
+
+    def read(self, out):
+        """Read one raw count per board into `out`"""
+        GPIO = self.GPIO
+        while not self.is_ready():
+            time.sleep(0.0005)
+        values = self._values
+        for i in range(self.channels):
+            values[i] = 0
+        for _ in range(24):
+            GPIO.output(self.sck_pin, True)
+            GPIO.output(self.sck_pin, False)
+            for i, pin in enumerate(self.dout_pins):
+                values[i] = (values[i] << 1) | GPIO.input(pin)
+        for _ in range(self.gain_pulses):
+            GPIO.output(self.sck_pin, True)
+            GPIO.output(self.sck_pin, False)
+        for i, value in enumerate(values):
+            out[i] = value - 0x1000000 if value & 0x800000 else value  # 24-bit two's complement
+
+    def power_down(self):
+        GPIO = self.GPIO
+        GPIO.output(self.sck_pin, False)
+        GPIO.output(self.sck_pin, True)
+        time.sleep(0.0001)   # SCK high for >60 us powers every board down
+
+    def power_up(self):
+        self.GPIO.output(self.sck_pin, False)
+
+
+class InterleavedHX711:
+    """Independent HX711 objects, each read as soon as it is ready"""
+
+    def __init__(self, boards):
+        self.boards = list(boards)
+        self.channels = len(self.boards)
+
+    def is_ready(self):
+        return all(board.is_ready() for board in self.boards)
+
+    def read(self, out):
+        pending = list(range(self.channels))
+        while pending:
+            for i in list(pending):
+                if len(pending) == 1 or self.boards[i].is_ready():
+                    out[i] = self.boards[i].read_long()
+                    pending.remove(i)
+            if pending:
+                time.sleep(0.0005)
+
+    def power_down(self):
+        for board in self.boards:
+            board.power_down()
+
+    def power_up(self):
+        for board in self.boards:
+            board.power_up()
+
+
+class MultiScale:
+    """Sample a bank of load cells into a ring buffer of per-channel readings"""
+
+    def __init__(self, bank, reference_units=210.0, size=256, filter_name="median", **filter_options):
+        n = bank.channels
+        self.bank = bank
+        self.channels = n
+        self.size = size
+        self.offsets = np.zeros(n)
+        self.reference_units = np.full(n, reference_units, dtype=float)
+        self.times = np.zeros(size)
+        self.raw = np.zeros((size, n), dtype=np.int64)
+        self.weights = np.zeros(n)                 # latest filtered weight per channel
+        self.count = 0
+        self.listeners = []                        # callback(total, timestamp) per tick
+        self.filters = [make_filter(filter_name, **filter_options) for _ in range(n)]
+        self._tick = np.zeros(n, dtype=np.int64)
+        self._unfiltered = np.zeros(n)
+        self._stop = threading.Event()
+        self._thread = None
+
+    # ── Lifecycle ──
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="multi-scale", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+            self._thread = None
+
+    def wake(self):
+        """A bank has no power policy and always streams; here for calibration_jobs"""
+
+    def _run(self):
+        while not self._stop.is_set():
+            with span("hx711.bank_read"):
+                self.bank.read(self._tick)
+            self._push(time.monotonic(), self._tick)
+
+    def _push(self, timestamp, tick):
+        slot = self.count % self.size
+        self.times[slot] = timestamp
+        self.raw[slot] = tick
+        np.subtract(tick, self.offsets, out=self._unfiltered)
+        self._unfiltered /= self.reference_units
+        for i, weight_filter in enumerate(self.filters):
+            self.weights[i] = weight_filter.update(self._unfiltered[i], timestamp)
+        self.count += 1
+        if self.listeners:
+            total = float(self.weights.sum())
+            for listener in self.listeners:
+                listener(total, timestamp)
+
+    # ── Readers ──
+    def latest_weights(self):
+        """Copy of the latest filtered weight of every channel"""
+        return self.weights.copy()
+
+    def total(self):
+        return float(self.weights.sum())
+
+    def mean_raw(self, samples):
+        """Per-channel mean raw count over the newest `samples` ticks"""
+        samples = min(samples, self.count, self.size)
+        if samples == 0:
+            return np.zeros(self.channels)
+        slots = (self.count - 1 - np.arange(samples)) % self.size
+        return self.raw[slots].mean(axis=0)
+
+    def wait_samples(self, samples, timeout=None):
+        target = self.count + samples
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self.count < target:
+            if deadline is not None and time.monotonic() > deadline:
+                return False
+            time.sleep(0.005)
+        return True
+
+    # ── Calibration ──
+    def tare(self, samples=10, channel=None):
+        """Zero one channel, or all of them, from fresh samples"""
+        self.wait_samples(samples, timeout=10)
+        mean = self.mean_raw(samples)
+        channels = range(self.channels) if channel is None else [channel]
+        for i in channels:
+            self.set_offset(i, mean[i])
+
+    def calibrate(self, channel, known_weight, samples=10):
+        """Set a channel's reference unit from a known weight resting on it"""
+        if known_weight <= 0:
+            raise ValueError("Known weight must be more than 0 g")
+        self.wait_samples(samples, timeout=10)
+        counts = self.mean_raw(samples)[channel] - self.offsets[channel]
+        if abs(counts) < 1:
+            raise ValueError(f"No load detected on channel {channel}")
+        self.set_reference_unit(channel, counts / known_weight)
+        return self.reference_units[channel]
+
+    def set_offset(self, channel, offset):
+        self.offsets[channel] = offset
+        self.filters[channel].reset()
+
+    def set_reference_unit(self, channel, reference_unit):
+        self.reference_units[channel] = reference_unit
+        self.filters[channel].reset()
+
+
+if __name__ == "__main__":
+    import devices
+    from pixel_engine import BarGauge, Zone
+
+    DOUT_PINS = (6, 13, 19, 26)  # One DOUT per HX711 board
+    SCK_PIN = 5                  # Shared clock
+
+    ZONE_PIXELS = 30             # NeoPixels per channel, one bar each on a shared strip
+    MAX_WEIGHT = 1000.0          # Grams for a full bar
+
+    scale = MultiScale(devices.open_scale_bank(DOUT_PINS, SCK_PIN), filter_name="median", window=5)
+    pixels = devices.open_pixels(ZONE_PIXELS * len(DOUT_PINS))
+    zones = [Zone(i * ZONE_PIXELS, ZONE_PIXELS, MAX_WEIGHT) for i in range(len(DOUT_PINS))]
+    gauge = BarGauge(pixels, ZONE_PIXELS * len(DOUT_PINS), zones, brightness=0.5)
+    scale.start()
+    scale.tare()
+    try:
+        while True:
+            weights = scale.latest_weights()
+            gauge.render(weights)  # sends nothing when no bar moved
+            text = " ".join(f"{w:8.1f}" for w in weights)
+            print(f"\r{text} | Total: {scale.total():8.1f} g      ", end="", flush=True)
+            time.sleep(0.2)
+    except KeyboardInterrupt:
+        print()
+    finally:
+        scale.stop()
+        pixels.fill((0, 0, 0))
+        pixels.show()
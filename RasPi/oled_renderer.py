@@ -0,0 +1,140 @@
+from PIL import Image, ImageDraw, ImageFont
+from instrument import span
+
+# ┌──── OLED Weight Renderer ────┐
+# Fonts are loaded once and the characters a weight reading can contain are
+# pre-rasterised into a glyph atlas. A frame is composed by pasting glyphs,
+# packed into SH1107 pages (8 pixel rows, one byte per column) and compared
+# with what the panel already shows: only the changed column span of each
+# changed page goes over I2C, and an unchanged reading sends nothing.
+# pack_pages() and rotate_frame() are also what grove_sh1107.GroveSH1107 and
+# sim_devices.SimOLED use for full frames, so all three lay out pixels alike.
+
+FONT_PATHS = [
+    "/usr/share/fonts/truetype/liberation/LiberationMono-Bold.ttf",  # 7-segment-like monospace
+    "/usr/share/fonts/truetype/dejavu/DejaVuSansMono-Bold.ttf",
+    "/usr/share/fonts/truetype/dejavu/DejaVuSansMono.ttf",
+]
+CHARSET = "0123456789.- g"
+
+# Pillow packs mode "1" rows MSB-first; SH1107 pages want the top pixel in bit 0
+_REVERSE_BITS = bytes(int(f"{i:08b}"[::-1], 2) for i in range(256))
+
+
+def rotate_frame(image, rotate, size):
+    """Turn a frame `rotate` quarter turns clockwise and crop it to `size`, as luma's preprocess() does"""
+    if rotate == 0:
+        return image
+    return image.rotate(rotate * -90, expand=True).crop((0, 0) + tuple(size))
+
+
+def pack_pages(image):
+    """SH1107 page bytes of a frame: one bytes object per 8 pixel rows, one byte per column"""
+    image = image.convert("1")
+    num_pages = image.height // 8
+    # After TRANSPOSE each row holds one display column, packed 8 rows per byte
+    packed = image.transpose(Image.TRANSPOSE).tobytes().translate(_REVERSE_BITS)
+    return [packed[page::num_pages] for page in range(num_pages)]
+
+
+def load_font(size):
+    """First available monospace font, or Pillow's built-in bitmap font"""
+    for path in FONT_PATHS:
+        try:
+            return ImageFont.truetype(path, size)
+        except OSError:
+            continue
+    return ImageFont.load_default()
+
+
+class WeightRenderer:
+    """Draw weight readings on a luma SH1107 device from cached glyphs"""
+
+    def __init__(self, device, font_size=28):
+        self.device = device
+        self.font = load_font(font_size)
+        self.small_font = ImageFont.load_default()
+        self.frame = Image.new("1", device.size)
+        self.pages = [None] * (device.height // 8)  # bytes last sent per page
+        self.last_text = None
+        self.bytes_sent = 0
+        self._build_atlas()
+
+    # ── Glyph atlas ──
+    def _build_atlas(self):
+        left, top, right, bottom = self.font.getbbox(CHARSET)
+        self.cell_top = top
+        self.cell_height = bottom - top
+        self.cell_width = max(int(round(self.font.getlength(ch))) for ch in CHARSET)
+        self.atlas = Image.new("1", (self.cell_width * len(CHARSET), self.cell_height))
+        draw = ImageDraw.Draw(self.atlas)
+        self.glyphs = {}
+        for i, ch in enumerate(CHARSET):
+            draw.text((i * self.cell_width, -top), ch, font=self.font, fill=1)
+        for i, ch in enumerate(CHARSET):
+            x = i * self.cell_width
+            self.glyphs[ch] = self.atlas.crop((x, 0, x + self.cell_width, self.cell_height))
+
+    def _glyph(self, ch):
+        # Characters outside CHARSET (e.g. "inf") are rasterised on first use and kept
+        glyph = self.glyphs.get(ch)
+        if glyph is None:
+            glyph = Image.new("1", (self.cell_width, self.cell_height))
+            ImageDraw.Draw(glyph).text((0, -self.cell_top), ch, font=self.font, fill=1)
+            self.glyphs[ch] = glyph
+        return glyph
+
+    # ── Frames ──
+    def render(self, weight):
+        """Show a weight; returns False when the display already shows it"""
+        weight_text = f"{weight:6.1f}g"  # 6 characters wide for consistent spacing
+        if weight_text == self.last_text:
+            return False
+        self.last_text = weight_text
+
+        frame = self.frame
+        with span("oled.compose"):
+            frame.paste(0, (0, 0) + frame.size)
+            x = (frame.width - self.cell_width * len(weight_text)) // 2
+            y = (frame.height - self.cell_height) // 2
+            for ch in weight_text:
+                frame.paste(self._glyph(ch), (x, y))
+                x += self.cell_width
+        self.flush()
+        return True
+
+    def message(self, *lines):
+        """Show status text given as (x, y, text) tuples in the default font"""
+        self.frame.paste(0, (0, 0) + self.frame.size)
+        draw = ImageDraw.Draw(self.frame)
+        for x, y, text in lines:
+            draw.text((x, y), text, font=self.small_font, fill=1)
+        self.last_text = None  # next render() must redraw the reading
+        self.flush()
+
+    def flush(self):
+        """Send the pages of the frame that differ from what the panel shows"""
+        with span("oled.flush"):
+            self._flush()
+
+    def _flush(self):
+        device = self.device
+        for page, data in enumerate(pack_pages(device.preprocess(self.frame))):  # applies the device rotation
+            previous = self.pages[page]
+            if data == previous:
+                continue
+            if previous is None:
+                first, last = 0, len(data) - 1
+            else:
+                first = next(i for i in range(len(data)) if data[i] != previous[i])
+                last = next(i for i in range(len(data) - 1, -1, -1) if data[i] != previous[i])
+            # Page address, then column address low/high nibble
+            device.command(0xB0 | page, 0x00 | (first & 0x0F), 0x10 | (first >> 4))
+            device.data(list(data[first:last + 1]))
+            self.pages[page] = data
+            self.bytes_sent += last - first + 1
+
+    def invalidate(self):
+        """Forget what the panel shows, e.g. after it was cleared elsewhere"""
+        self.pages = [None] * len(self.pages)
+        self.last_text = None
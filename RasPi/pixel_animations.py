@@ -0,0 +1,212 @@
+import time
+import numpy as np
+from pixel_engine import HUE_STEPS, GAMMA, Dither, build_hue_lut, build_level_lut, to_bytes, write_frame
+
+# ┌──── NeoPixel Animations ────┐
+# Effects are generators that draw whole frames. An effect is called once
+# with its own preallocated RGB frame (num_pixels x 3, uint8) and then, for
+# every frame, is sent the seconds since it started and redraws the frame in
+# place; returning ends the effect. For example:
+#
+#   def blink(frame, color, period=1.0):
+#       while True:
+#           t = yield
+#           frame[:] = color if t % period < period / 2 else 0
+#
+# The Animator layers effects ("over" draws a layer's lit pixels on top,
+# "add" adds them with saturation), converts the result to the strip's wire
+# order, gamma and brightness in one table lookup (optionally dithered, see
+# pixel_engine), and sends it in a single write.
+# Frames run on a fixed timestep: effect time advances in exact 1/fps steps,
+# and when a frame overruns, the missed frames are skipped rather than
+# replayed, so animations keep wall-clock speed on slow or long strips.
+
+
+# ┌──── Effects ────┐
+def wipe(frame, color, duration=3.0):
+    """Light the strip one pixel after another over `duration` seconds"""
+    n = len(frame)
+    frame[:] = 0
+    t = yield
+    while t < duration:
+        frame[:int(n * t / duration)] = color
+        t = yield
+    frame[:] = color
+    yield
+
+
+def hold(frame, color=(0, 0, 0), duration=1.0):
+    """One colour on every pixel for `duration` seconds"""
+    frame[:] = color
+    t = yield
+    while t < duration:
+        t = yield
+
+
+def rainbow(frame, period=5.0, spread=1.0, steps=HUE_STEPS):
+    """Rainbow `spread` hue cycles long, rotating once every `period` seconds"""
+    lut = build_hue_lut(steps, 1.0, "RGB")
+    offsets = (np.arange(len(frame)) * spread * steps / len(frame)).astype(np.intp)
+    index = np.empty(len(frame), dtype=np.intp)
+    while True:
+        t = yield
+        np.add(offsets, int(t / period * steps), out=index)
+        np.remainder(index, steps, out=index)
+        np.take(lut, index, axis=0, out=frame)
+
+
+def chase(frame, color, spacing=3, speed=10.0):
+    """Every `spacing`-th pixel lit, moving `speed` pixels per second"""
+    positions = np.arange(len(frame))
+    lit = np.empty(len(frame), dtype=bool)
+    while True:
+        t = yield
+        np.equal((positions - int(t * speed)) % spacing, 0, out=lit)
+        frame[:] = 0
+        frame[lit] = color
+
+
+def weight_bar(frame, source, max_weight=1000.0, color=(0, 255, 0)):
+    """Bar proportional to source() / max_weight; the last pixel is partly lit"""
+    n = len(frame)
+    color = np.array(color, dtype=np.float32)
+    while True:
+        yield
+        level = max(0.0, min(1.0, source() / max_weight)) * n
+        full = int(level)
+        frame[:full] = color
+        frame[full:] = 0
+        if full < n:
+            frame[full] = color * (level - full)
+
+
+def sequence(frame, effects, loop=True):
+    """Run effect factories (e.g. functools.partial(wipe, color=...)) one after another"""
+    t = yield
+    while True:
+        for effect in effects:
+            step = effect(frame)
+            next(step)
+            started = t
+            try:
+                while True:
+                    step.send(t - started)
+                    t = yield
+            except StopIteration:
+                pass
+        if not loop:
+            return
+
+
+# ┌──── Animator ────┐
+class Layer:
+    """One running effect and the frame it draws into"""
+
+    def __init__(self, effect, num_pixels, blend, options):
+        self.frame = np.zeros((num_pixels, 3), dtype=np.uint8)
+        self.blend = blend
+        self.started = None
+        self.generator = effect(self.frame, **options)
+        next(self.generator)
+
+
+class Animator:
+    """Composite effect layers and push frames to a strip at a fixed rate"""
+
+    def __init__(self, pixels, num_pixels, fps=60, brightness=1.0, order="GRB", gamma=GAMMA, dither=False):
+        self.pixels = pixels
+        self.num_pixels = num_pixels
+        self.period = 1.0 / fps
+        self.layers = []
+        self.channels = np.array(["RGB".index(c) for c in order], dtype=np.intp)
+        self.fixed_levels = build_level_lut(brightness, gamma)  # gamma and brightness, applied once per frame
+        self.levels = to_bytes(self.fixed_levels)
+        self.dither = Dither((num_pixels, len(order))) if dither else None
+        self._fixed = np.zeros((num_pixels, len(order)), dtype=np.uint16)
+        self.composite = np.zeros((num_pixels, 3), dtype=np.uint8)
+        self._sum = np.zeros((num_pixels, 3), dtype=np.uint16)  # scratch for "add" blending
+        self.buf = bytearray(num_pixels * len(order))
+        self.wire = np.frombuffer(self.buf, dtype=np.uint8).reshape(num_pixels, len(order))
+        self.frames = 0
+        self.skipped = 0               # frames dropped to keep up with the clock
+        self.render_time = 0.0         # seconds spent in effects and compositing
+        self.show_time = 0.0           # seconds spent sending frames
+        self.started = None
+
+    def add(self, effect, blend="over", **options):
+        """Start `effect` as the new top layer"""
+        if blend not in ("over", "add"):
+            raise ValueError(f"Unknown blend {blend!r}; use 'over' or 'add'")
+        layer = Layer(effect, self.num_pixels, blend, options)
+        self.layers.append(layer)
+        return layer
+
+    def remove(self, layer):
+        if layer in self.layers:
+            self.layers.remove(layer)
+
+    def render(self, now):
+        """Advance every layer to `now` and composite them; finished layers are dropped"""
+        composite = self.composite
+        composite[:] = 0
+        for layer in list(self.layers):
+            if layer.started is None:
+                layer.started = now
+            try:
+                layer.generator.send(now - layer.started)
+            except StopIteration:
+                self.layers.remove(layer)
+                continue
+            if layer.blend == "over":
+                np.copyto(composite, layer.frame, where=layer.frame.any(axis=1)[:, None])
+            else:
+                np.add(composite, layer.frame, out=self._sum, dtype=np.uint16)  # widen before adding
+                np.minimum(self._sum, 255, out=self._sum)
+                composite[:] = self._sum
+        np.take(composite, self.channels, axis=1, out=self.wire)
+        if self.dither is None:
+            np.take(self.levels, self.wire, out=self.wire)
+        else:
+            np.take(self.fixed_levels, self.wire, out=self._fixed)
+            self.dither.apply(self._fixed, self.wire)
+
+    def show(self):
+        write_frame(self.pixels, self.buf)
+
+    def run(self, duration=None, stop=None):
+        """Play until every layer finished, `duration` elapsed or `stop` (an Event) is set"""
+        self.started = time.monotonic()
+        deadline = self.started
+        while self.layers and not (stop is not None and stop.is_set()):
+            if duration is not None and deadline - self.started >= duration:
+                break
+            started = time.perf_counter()
+            self.render(deadline)
+            rendered = time.perf_counter()
+            self.show()
+            self.render_time += rendered - started
+            self.show_time += time.perf_counter() - rendered
+            self.frames += 1
+            deadline += self.period
+            delay = deadline - time.monotonic()
+            if delay < 0:
+                # Overran: skip the missed frames instead of rushing through them
+                missed = int(-delay / self.period) + 1
+                self.skipped += missed
+                deadline += missed * self.period
+                delay = deadline - time.monotonic()
+            if stop is not None:
+                stop.wait(max(0.0, delay))
+            else:
+                time.sleep(max(0.0, delay))
+
+    def stats(self):
+        elapsed = time.monotonic() - self.started if self.started else 0.0
+        frames = self.frames or 1
+        return {
+            "fps": self.frames / elapsed if elapsed > 0 else 0.0,
+            "frames": self.frames,
+            "skipped": self.skipped,
+            "render_ms": 1000 * self.render_time / frames,
+            "show_ms": 1000 * self.show_time / frames,
+        }
@@ -0,0 +1,201 @@
+import colorsys
+import numpy as np
+from instrument import span
+
+try:
+    from neopixel_write import neopixel_write
+except ImportError:  # Not on a Pi; simulated strips provide write_frame()
+    neopixel_write = None
+
+# ┌──── NeoPixel Colour Engine ────┐
+# Hue -> colour conversion is done once: a lookup table holds the wire bytes
+# (GRB order, gamma and brightness already applied) for HUE_STEPS quantised
+# hues. A frame is then one vectorised table lookup into a preallocated
+# bytearray that is sent to the strip in a single neopixel_write() call, so
+# the library's own float brightness scaling is left at 1.0.
+#
+# LEDs respond linearly to the PWM duty but eyes do not, so levels go through
+# a gamma curve. At low brightness that leaves few distinct 8-bit steps and
+# gradients band; tables therefore keep 8.8 fixed-point levels (uint16), and
+# with dither=True the fractional part is carried from frame to frame per
+# pixel, so e.g. level 3.25 shows as 3, 3, 3, 4, ... and averages out.
+
+HUE_STEPS = 1024
+GAMMA = 2.6  # Typical for WS2812 LEDs; 1.0 = linear
+
+
+def build_level_lut(brightness=1.0, gamma=GAMMA):
+    """8.8 fixed-point output level for each 8-bit input level"""
+    levels = (np.arange(256) / 255.0) ** gamma * brightness * 255 * 256
+    return np.round(levels).astype(np.uint16)
+
+
+def build_hue_table(steps=HUE_STEPS, brightness=1.0, order="GRB", gamma=GAMMA):
+    """8.8 fixed-point wire levels for `steps` evenly spaced, fully saturated hues"""
+    channels = ["RGB".index(c) for c in order]
+    rgb = np.array([colorsys.hsv_to_rgb(i / steps, 1.0, 1.0) for i in range(steps)])
+    levels = rgb[:, channels] ** gamma * brightness * 255 * 256
+    return np.round(levels).astype(np.uint16)
+
+
+def build_hue_lut(steps=HUE_STEPS, brightness=1.0, order="GRB", gamma=1.0):
+    """Wire bytes for `steps` evenly spaced, fully saturated hues"""
+    return to_bytes(build_hue_table(steps, brightness, order, gamma))
+
+
+def to_bytes(fixed):
+    """Round 8.8 fixed-point levels to 8-bit"""
+    return ((fixed.astype(np.uint32) + 128) >> 8).astype(np.uint8)
+
+
+class Dither:
+    """Temporal dithering: each pixel's fractional level is carried into the next frame"""
+
+    def __init__(self, shape):
+        self.error = np.zeros(shape, dtype=np.uint16)   # fraction left over, in 1/256 steps
+        self.levels = np.zeros(shape, dtype=np.uint16)
+
+    def apply(self, fixed, out):
+        """Write 8-bit levels for the 8.8 `fixed` levels into `out`"""
+        # At most 65280 + 255, so the sum never overflows uint16
+        np.add(fixed, self.error, out=self.levels)
+        np.bitwise_and(self.levels, 0xFF, out=self.error)
+        np.right_shift(self.levels, 8, out=self.levels)
+        np.copyto(out, self.levels, casting="unsafe")
+
+
+def write_frame(pixels, buf):
+    """Send a whole frame to the strip in one transfer"""
+    with span("neopixel.show"):
+        if hasattr(pixels, "write_frame"):
+            pixels.write_frame(buf)
+        else:
+            neopixel_write(pixels.pin, buf)
+
+
+class PixelEngine:
+    """Build whole-strip rainbow frames from a precomputed hue table"""
+
+    def __init__(self, pixels, num_pixels, brightness=1.0, spread=0.3, order="GRB", steps=HUE_STEPS,
+                 gamma=GAMMA, dither=False):
+        self.pixels = pixels
+        self.num_pixels = num_pixels
+        self.steps = steps
+        self.table = build_hue_table(steps, brightness, order, gamma)
+        self.lut = to_bytes(self.table)
+        # With dithering the frame must be resent continuously, even for an unchanged hue
+        self.dither = Dither((num_pixels, len(order))) if dither else None
+        self._fixed = np.empty((num_pixels, len(order)), dtype=np.uint16)
+        # Hue offset of each pixel along the strip, in table steps
+        self.offsets = (np.arange(num_pixels) * spread * steps / num_pixels).astype(np.intp)
+        self.buf = bytearray(num_pixels * len(order))
+        self.frame = np.frombuffer(self.buf, dtype=np.uint8).reshape(num_pixels, len(order))
+        self._index = np.empty(num_pixels, dtype=np.intp)
+
+    def render_hue(self, hue):
+        """Rainbow starting at `hue` (0-1) and spreading along the strip"""
+        np.add(self.offsets, int(hue * self.steps), out=self._index)
+        np.remainder(self._index, self.steps, out=self._index)
+        if self.dither is None:
+            np.take(self.lut, self._index, axis=0, out=self.frame)
+        else:
+            np.take(self.table, self._index, axis=0, out=self._fixed)
+            self.dither.apply(self._fixed, self.frame)
+        self.show()
+
+    def show(self):
+        write_frame(self.pixels, self.buf)
+
+
+# ┌──── Bar Gauge ────┐
+# Each zone is a run of pixels showing one value as a bar: pixels up to the
+# level are lit in the zone's colour gradient (precomputed as wire bytes),
+# the pixel at the level is partly lit for sub-pixel resolution, the rest
+# are off. A new value only rewrites the pixels between the old and the new
+# level, so the work per frame follows the change, not the strip length, and
+# when no zone's level changed nothing is sent at all.
+
+GAUGE_COLORS = ((0, 255, 0), (255, 255, 0), (255, 0, 0))  # green -> yellow -> red
+
+
+class Zone:
+    """Pixels start..start+length-1 showing value / max_value as a bar"""
+
+    def __init__(self, start, length, max_value=1000.0, colors=GAUGE_COLORS):
+        self.start = start
+        self.length = length
+        self.max_value = max_value
+        self.colors = colors
+        self.level = 0          # lit length in 1/256 pixel, as last drawn
+
+    def gradient(self):
+        """Linear RGB (0-1) of each pixel when lit"""
+        stops = np.linspace(0.0, 1.0, len(self.colors))
+        position = np.linspace(0.0, 1.0, self.length)
+        colors = np.array(self.colors, dtype=np.float64) / 255
+        return np.stack([np.interp(position, stops, colors[:, c]) for c in range(3)], axis=1)
+
+
+class BarGauge:
+    """One bar per zone on a shared strip, redrawn incrementally"""
+
+    def __init__(self, pixels, num_pixels, zones, brightness=1.0, order="GRB", gamma=GAMMA):
+        self.pixels = pixels
+        self.num_pixels = num_pixels
+        self.zones = zones
+        channels = ["RGB".index(c) for c in order]
+        # Lit colour of every pixel in 8.8 fixed point, and rounded to wire bytes
+        self.lit_fixed = np.zeros((num_pixels, len(order)), dtype=np.uint16)
+        for zone in zones:
+            rgb = zone.gradient()[:, channels]
+            self.lit_fixed[zone.start:zone.start + zone.length] = np.round(rgb ** gamma * brightness * 255 * 256)
+        self.lit = to_bytes(self.lit_fixed)
+        self.buf = bytearray(num_pixels * len(order))
+        self.frame = np.frombuffer(self.buf, dtype=np.uint8).reshape(num_pixels, len(order))
+        self.frames = 0
+        self.skipped = 0        # render() calls where nothing changed
+        self.pixels_written = 0
+
+    def render(self, values):
+        """Show one value per zone; returns False (and sends nothing) if no pixel changed"""
+        changed = False
+        for zone, value in zip(self.zones, values):
+            fraction = max(0.0, min(1.0, value / zone.max_value))
+            level = int(fraction * zone.length * 256)
+            if level != zone.level:
+                self._draw(zone, zone.level, level)
+                zone.level = level
+                changed = True
+        if not changed:
+            self.skipped += 1
+            return False
+        self.show()
+        self.frames += 1
+        return True
+
+    def _draw(self, zone, old, new):
+        old_full, new_full = old >> 8, new >> 8
+        # Pixels from the lower to the higher level, including both partial pixels
+        lo = zone.start + min(old_full, new_full)
+        hi = zone.start + min(max(old_full, new_full) + 1, zone.length)
+        lit_end = zone.start + new_full
+        if lit_end > lo:
+            self.frame[lo:lit_end] = self.lit[lo:lit_end]
+        self.frame[max(lo, lit_end):hi] = 0
+        if new_full < zone.length:
+            # Partial pixel: scale its lit colour in linear light
+            pixel = lit_end
+            self.frame[pixel] = to_bytes((self.lit_fixed[pixel].astype(np.uint32) * (new & 0xFF)) >> 8)
+        self.pixels_written += hi - lo
+
+    def redraw(self):
+        """Draw every zone from scratch, e.g. after the strip was cleared"""
+        self.frame[:] = 0
+        for zone in self.zones:
+            level, zone.level = zone.level, 0
+            self._draw(zone, 0, level)
+            zone.level = level
+        self.show()
+
+    def show(self):
+        write_frame(self.pixels, self.buf)
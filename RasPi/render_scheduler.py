@@ -0,0 +1,123 @@
+import threading
+import time
+from instrument import span
+
+# ┌──── Render Scheduler ────┐
+# Each output device (terminal, OLED, NeoPixels, ...) gets its own thread and
+# frame rate. On every tick an output pulls the newest value from `source`, so
+# intermediate readings are coalesced and only the latest is drawn. Timing is
+# deadline based: a frame that overruns its slot drops the missed ticks rather
+# than bursting to catch up. Outputs never push back on the source, so a slow
+# I2C transfer only lowers that output's frame rate, never the sample rate.
+#
+# With event_driven=True outputs sleep until notify() is called (typically by
+# a change_detector.ChangeDetector) instead of waking on every tick; `fps`
+# then only caps how often they may draw. An idle scale costs no wakeups.
+
+
+class Output:
+    """One scheduled output and its frame statistics"""
+
+    def __init__(self, name, render, fps, on_change=True):
+        self.name = name
+        self.render = render
+        self.period = 1.0 / fps
+        self.on_change = on_change     # False: draw every tick, e.g. for dithering or animation
+        self.span_name = f"render.{name}"
+        self.changed = threading.Event()  # set by notify() in event-driven mode
+        self.last_value = None
+        self.frames = 0                # frames actually drawn
+        self.skipped_ticks = 0         # ticks lost because a frame overran its deadline
+        self.render_time = 0.0         # seconds spent inside render()
+        self.thread = None
+
+    def fps(self, elapsed):
+        return self.frames / elapsed if elapsed > 0 else 0.0
+
+
+class RenderScheduler:
+    """Drive several outputs from one value source at independent frame rates"""
+
+    def __init__(self, source, event_driven=False):
+        self.source = source
+        self.event_driven = event_driven
+        self.outputs = []
+        self.started = None
+        self._stop = threading.Event()
+
+    def add_output(self, name, render, fps, on_change=True):
+        """Add an output; once the scheduler is running it starts drawing right away"""
+        output = Output(name, render, fps, on_change)
+        self.outputs.append(output)
+        if self.started is not None and not self._stop.is_set():
+            self._start_output(output)
+        return output
+
+    # ── Lifecycle ──
+    def start(self):
+        self._stop.clear()
+        self.started = time.monotonic()
+        for output in self.outputs:
+            self._start_output(output)
+        return self
+
+    def _start_output(self, output):
+        output.changed.set()  # draw the first frame right away
+        output.thread = threading.Thread(target=self._run, args=(output,), name=f"render-{output.name}", daemon=True)
+        output.thread.start()
+
+    def stop(self):
+        self._stop.set()
+        for output in self.outputs:
+            output.changed.set()
+            if output.thread is not None:
+                output.thread.join(timeout=2)
+                output.thread = None
+
+    def refresh(self, name=None):
+        """Redraw an output (or all) on its next tick even if the value is unchanged"""
+        for output in self.outputs:
+            if name is None or output.name == name:
+                output.last_value = None
+                output.changed.set()
+
+    def notify(self, *args):
+        """Wake event-driven outputs because the source has a new value"""
+        for output in self.outputs:
+            output.changed.set()
+
+    def _run(self, output):
+        deadline = time.monotonic()
+        while not self._stop.is_set():
+            if self.event_driven and output.on_change:
+                output.changed.wait()
+                output.changed.clear()
+                deadline = max(deadline, time.monotonic())
+            deadline += output.period
+            value = self.source()
+            if value != output.last_value or not output.on_change:
+                started = time.perf_counter()
+                with span(output.span_name):
+                    output.render(value)
+                output.render_time += time.perf_counter() - started
+                output.last_value = value
+                output.frames += 1
+            delay = deadline - time.monotonic()
+            if delay < 0:
+                output.skipped_ticks += int(-delay / output.period) + 1
+                deadline = time.monotonic()
+            else:
+                self._stop.wait(delay)
+
+    def stats(self):
+        """Per-output frames/s, skipped ticks and mean render time"""
+        elapsed = time.monotonic() - self.started if self.started else 0.0
+        return {
+            output.name: {
+                "fps": output.fps(elapsed),
+                "frames": output.frames,
+                "skipped_ticks": output.skipped_ticks,
+                "mean_render_ms": 1000 * output.render_time / output.frames if output.frames else 0.0,
+            }
+            for output in self.outputs
+        }
@@ -0,0 +1,487 @@
+import copy
+import json
+import os
+import sys
+import tty
+import termios
+import select
+import signal
+import time
+import argparse
+
+from startup import StartupProfile
+import devices
+import instrument
+from hx711_sampler import HX711Sampler, PowerPolicy
+from filters import make_filter
+from render_scheduler import RenderScheduler
+from change_detector import ChangeDetector
+from calibration_jobs import TareJob, CalibrationJob, ChannelTareJob, ChannelCalibrationJob, ZeroTracker
+from calibration_store import CalibrationStore
+
+# ┌──── Scale Runner ────┐
+# One acquisition pipeline for every scale script: HX711 → sampler (filter,
+# power policy) → change detector → event-driven render scheduler, with each
+# enabled output attached as soon as its device is ready. What runs, on which
+# pins and at which rates comes from a JSON config instead of the script:
+#
+#   python3 runner.py --config configs/weight_display.json
+#   RASPI_BACKEND=sim python3 runner.py --config my_scale.json --profile-startup
+#
+# A config only lists what differs from DEFAULT_CONFIG, e.g.
+#
+#   {"filter": {"name": "median", "window": 9},
+#    "outputs": {"neopixel": {"enabled": true, "mode": "bar", "fps": 30}}}
+#
+# "sensor" selects one HX711 ("hx711": dout/sck) or a bank of boards sharing
+# one clock ("multi": dout_pins/sck, see multi_scale.py) whose total drives
+# the outputs; a bank is tared and calibrated per channel and has no power
+# policy, zero tracking or log.
+#
+# Outputs: "terminal" (weight line, [t]are / [c]alibrate / [q]uit keys),
+# "oled" (SH1107 via luma, or "driver": "grove" for the Seeed Grove board
+# through grove_sh1107.py), "neopixel" (rainbow hue or bar gauge), "sound" (buzzer
+# beep when a reading settles), "http" (weight_server.py) and "log"
+# (weight_log.py). RASPI_HTTP_PORT and RASPI_WEIGHT_LOG still switch on the
+# last two. Without a terminal on stdin the runner just runs until Ctrl+C or
+# SIGTERM, e.g. as a service publishing over HTTP.
+
+CONFIG_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "configs")
+
+DEFAULT_CONFIG = {
+    "sensor": {"type": "hx711", "dout": 6, "sck": 5, "reference_unit": 210.0,  # BCM pins; unit until calibrated
+               "dout_pins": [6, 13, 19, 26]},  # "multi": one DOUT per board, all clocked by sck
+    "filter": {"name": "spike+median", "threshold": 50.0, "window": 5},  # see filters.FILTERS
+    "sampler": {"size": 256, "idle_timeout": 30.0, "settle_samples": 4},  # idle_timeout null = never power down
+    "detector": {"deadband": 1.0, "settle_band": 1.0, "unsettle_band": 3.0, "settle_time": 1.0},  # change_detector.py
+    "calibration": {"stable_window": 8, "stable_std": 1.0},  # tare/calibration settle criteria
+    "key_poll": 0.05,  # seconds the main loop waits for a key press
+    "outputs": {
+        "terminal": {"enabled": True, "fps": 10, "title": "HX711 Scale", "show_hue": False},
+        "oled": {"enabled": False, "driver": "luma", "fps": 10, "port": 1, "address": 0x3C, "width": 128, "height": 128,
+                 "rotate": 2, "font_size": 28},
+        "neopixel": {"enabled": False, "fps": 60, "num_pixels": 30, "pin": "D18", "order": "GRB",
+                     "brightness": 0.5, "mode": "rainbow", "spread": 0.3, "dither": False,
+                     "min_weight": 0.0, "max_weight": 1000.0},
+        "sound": {"enabled": False, "fps": 10, "pin": 12, "frequency": 2000, "beep": 0.08},
+        "http": {"enabled": False, "host": "127.0.0.1", "port": 8080, "max_rate": 20.0},  # "0.0.0.0" for the LAN
+        "log": {"enabled": False, "directory": None, "flush_interval": 1.0, "fsync": "interval",
+                "segment_seconds": 3600, "max_segments": None},
+    },
+}
+OUTPUTS = tuple(DEFAULT_CONFIG["outputs"])
+SENSORS = ("hx711", "multi")
+
+
+def _merge(defaults, overrides, path):
+    """Copy of `defaults` updated from `overrides`; unknown keys are errors"""
+    merged = copy.deepcopy(defaults)
+    for key, value in overrides.items():
+        if key not in defaults:
+            where = f" in '{path}'" if path else ""
+            raise ValueError(f"Unknown config key '{key}'{where}, choose from: {', '.join(defaults)}")
+        if isinstance(defaults[key], dict):
+            merged[key] = _merge(defaults[key], value, f"{path}.{key}" if path else key)
+        else:
+            merged[key] = value
+    return merged
+
+
+def load_config(path=None):
+    """DEFAULT_CONFIG overlaid with the JSON file at `path` and the environment"""
+    overrides = {}
+    if path:
+        with open(path) as f:
+            overrides = json.load(f)
+    config = _merge(DEFAULT_CONFIG, overrides, "")
+    outputs = config["outputs"]
+    if config["sensor"]["type"] not in SENSORS:
+        raise ValueError(f"Unknown sensor type '{config['sensor']['type']}', choose from: {', '.join(SENSORS)}")
+    if os.environ.get("RASPI_HTTP_PORT"):
+        outputs["http"].update(enabled=True, port=int(os.environ["RASPI_HTTP_PORT"]))
+    if os.environ.get("RASPI_WEIGHT_LOG"):
+        outputs["log"].update(enabled=True, directory=os.environ["RASPI_WEIGHT_LOG"])
+    if outputs["log"]["enabled"] and not outputs["log"]["directory"]:
+        raise ValueError("The log output needs a 'directory' (or set RASPI_WEIGHT_LOG)")
+    if outputs["log"]["enabled"] and config["sensor"]["type"] == "multi":
+        raise ValueError("The log output records a single HX711 and cannot be used with the multi sensor")
+    if outputs["oled"]["driver"] not in ("luma", "grove"):
+        raise ValueError(f"Unknown oled driver '{outputs['oled']['driver']}', choose from: luma, grove")
+    if outputs["neopixel"]["mode"] not in ("rainbow", "bar"):
+        raise ValueError(f"Unknown neopixel mode '{outputs['neopixel']['mode']}', choose from: rainbow, bar")
+    return config
+
+
+class Runner:
+    """Scale pipeline and outputs built from a config dict (see load_config)"""
+
+    def __init__(self, config, profile=None):
+        self.config = config
+        self.outputs = config["outputs"]
+        self.profile = profile or StartupProfile()
+        self.status = ""         # Shown after the weight on the terminal line
+        self.devices = {}        # Output name -> opened device, for cleanup
+        self.oled_renderer = self.pixel_engine = self.gauge = None
+        self.server = self.logger = None
+        self.sampler = self.multi = None  # HX711Sampler for "hx711", MultiScale for "multi"
+        self.scale = None                 # whichever of the two is sampling
+        self.zero_tracker = None
+        self.jobs = []           # Tare or calibration running over the live sample stream, one per bank channel
+        self.entry = None        # Known weight being typed during calibration
+        self.interactive = self.outputs["terminal"]["enabled"] and sys.stdin.isatty()
+        self._last_stable = False
+
+    # ── Pipeline ──
+    def open_scale(self):
+        """Open and calibrate the configured sensor and build the detector and scheduler"""
+        if self.config["sensor"]["type"] == "multi":
+            self._open_multi()
+        else:
+            self._open_hx711()
+        # Outputs sleep until the weight moves past the deadband or settles, then
+        # draw the newest (weight, stable) state at no more than their frame rate
+        self.detector = ChangeDetector(**self.config["detector"])
+        self.scale.listeners.append(self.detector.update)
+        self.scheduler = RenderScheduler(lambda: self.detector.state, event_driven=True)
+        self.detector.subscribe(self.scheduler.notify)
+
+    def _open_hx711(self):
+        hx711 = self.config["sensor"]
+        sampler = self.config["sampler"]
+        settle = sampler["settle_samples"]
+        policy = None
+        if sampler["idle_timeout"]:
+            policy = PowerPolicy(idle_timeout=sampler["idle_timeout"], settle_samples=settle)
+        with self.profile.step("hx711"):
+            self.hx = hx = devices.open_hx711(dout=hx711["dout"], sck=hx711["sck"])
+            hx.set_reading_format("MSB", "MSB")
+            hx.reset()
+            # Reuse the last calibration so readings are valid immediately; tare only on first run
+            self.calibration = CalibrationStore()
+            if not self.calibration.apply(hx):
+                hx.set_reference_unit(hx711["reference_unit"])
+                # reset() power-cycled the chip: its first readings are off and must not become the zero
+                for _ in range(settle):
+                    hx.read_long()
+                hx.tare()
+                self.calibration.save_hx711(hx)
+        options = dict(self.config["filter"])
+        weight_filter = make_filter(options.pop("name"), **options)
+        self.scale = self.sampler = HX711Sampler(hx, size=sampler["size"], weight_filter=weight_filter,
+                                                 power_policy=policy, settle_samples=settle)
+        self.zero_tracker = ZeroTracker(self.sampler)  # Follows slow zero drift of the empty scale
+
+    def _open_multi(self):
+        from multi_scale import MultiScale  # numpy is only needed for a bank
+        sensor = self.config["sensor"]
+        options = dict(self.config["filter"])
+        with self.profile.step("hx711"):
+            bank = devices.open_scale_bank(sensor["dout_pins"], sensor["sck"])
+            self.scale = self.multi = MultiScale(bank, sensor["reference_unit"], size=self.config["sampler"]["size"],
+                                                 filter_name=options.pop("name"), **options)
+            # Channels without a stored calibration are tared once sampling runs
+            self.calibration = CalibrationStore()
+            self._untared = self.calibration.apply_scale(self.multi)
+
+    def start(self):
+        """Start sampling; slow outputs are initialised on their own threads"""
+        if self.outputs["terminal"]["enabled"]:
+            self.print_header()
+            self.scheduler.add_output("terminal", self.print_weight, fps=self.outputs["terminal"]["fps"])
+        self.scale.start()
+        self.scheduler.start()
+        for name in OUTPUTS[1:]:
+            if self.outputs[name]["enabled"]:
+                self.profile.start(name, getattr(self, f"_init_{name}"), done=self.attach_output)
+        self.scale.wait_samples(1, timeout=2)
+        self.profile.mark("first reading")
+        if self.multi is not None and self._untared:
+            self.tare_channels(self._untared)
+        instrument.start_reporting()  # RASPI_INSTRUMENT=1; see instrument.py for export options
+        self.set_status(f"First reading {self.profile.elapsed():.2f} s after start")
+
+    def attach_output(self, name, error):
+        """Called on an init thread once an output is ready (or failed)"""
+        if error is not None:
+            self.set_status(f"{name} unavailable: {error}")
+        elif name in ("oled", "neopixel", "sound"):
+            options = self.outputs[name]
+            on_change = not (name == "neopixel" and options["dither"])  # dithering redraws every frame
+            self.scheduler.add_output(name, getattr(self, f"update_{name}"), fps=options["fps"], on_change=on_change)
+
+    # ── Outputs ──
+    def _init_oled(self):
+        from oled_renderer import WeightRenderer
+        options = self.outputs["oled"]
+        open_oled = devices.open_grove_oled if options["driver"] == "grove" else devices.open_oled
+        oled = open_oled(options["port"], options["address"], options["width"], options["height"], options["rotate"])
+        self.devices["oled"] = oled
+        self.oled_renderer = WeightRenderer(oled, font_size=options["font_size"])  # Fonts load once here
+        self.oled_renderer.render(0.0)
+
+    def _init_neopixel(self):
+        from pixel_engine import PixelEngine, BarGauge, Zone
+        options = self.outputs["neopixel"]
+        n, order, brightness = options["num_pixels"], options["order"], options["brightness"]
+        # Gamma and brightness are baked into the engine's tables; the library scales nothing
+        pixels = devices.open_pixels(n, pin=options["pin"], brightness=1.0, order=order)
+        if options["mode"] == "bar":
+            # One bar per load cell on a shared strip
+            channels = self.multi.channels if self.multi is not None else 1
+            zones = [Zone(i * (n // channels), n // channels, options["max_weight"]) for i in range(channels)]
+            self.gauge = BarGauge(pixels, n, zones, brightness=brightness, order=order)
+        else:
+            self.pixel_engine = PixelEngine(pixels, n, brightness=brightness, spread=options["spread"],
+                                            order=order, dither=options["dither"])
+        self.devices["neopixel"] = pixels
+
+    def _init_sound(self):
+        options = self.outputs["sound"]
+        buzzer = devices.open_buzzer(options["pin"], options["frequency"])
+        buzzer.start(0)
+        self.devices["sound"] = buzzer
+
+    def _init_http(self):
+        from weight_server import WeightServer
+        options = self.outputs["http"]
+        self.server = WeightServer(self.reading, host=options["host"], port=options["port"],
+                                   max_rate=options["max_rate"]).start()
+        self.detector.subscribe(self.server.notify)
+
+    def _init_log(self):
+        from weight_log import WeightLogger
+        options = dict(self.outputs["log"])
+        del options["enabled"]
+        self.logger = WeightLogger(self.sampler, options.pop("directory"), **options).start()
+
+    def print_header(self):
+        title = self.outputs["terminal"]["title"]
+        os.system("clear")
+        print("═══════════════════════════════════════")
+        print(f"    {title}")
+        print("═══════════════════════════════════════")
+        print("Controls:")
+        print("  [t] → Tare (zero scale)")
+        print("  [c] → Calibrate with known weight")
+        print("  [q] → Quit")
+        print("═══════════════════════════════════════\n")
+
+    def print_weight(self, state):
+        weight, stable = state
+        line = f"Weight: {weight:.2f} g {'(stable)' if stable else '        '}"
+        if self.outputs["terminal"]["show_hue"]:
+            line += f" | Hue: {self.weight_to_hue(weight):.3f}"
+        if self.status:
+            line += f" | {self.status}"
+        print(f"\r{line}\x1b[K", end="", flush=True)  # \x1b[K clears the rest of a longer old line
+
+    def set_status(self, message):
+        self.status = message
+        if self.outputs["terminal"]["enabled"]:
+            self.scheduler.refresh("terminal")
+
+    def update_oled(self, state):
+        """Unchanged readings send nothing to the display"""
+        self.oled_renderer.render(state[0])
+
+    def weight_to_hue(self, weight):
+        """Convert weight to hue value (0-1) for rainbow colors"""
+        options = self.outputs["neopixel"]
+        low, high = options["min_weight"], options["max_weight"]
+        normalized = max(0, min(1, (weight - low) / (high - low)))
+        return normalized * 0.8  # Use 0.8 to avoid wrapping back to red too quickly
+
+    def update_neopixel(self, state):
+        if self.gauge is not None:
+            # Only pixels between the old and new level are redrawn
+            self.gauge.render(self.multi.latest_weights() if self.multi is not None else [state[0]])
+        else:
+            # Whole rainbow frame comes from the hue lookup table and is sent in one write
+            self.pixel_engine.render_hue(self.weight_to_hue(state[0]))
+
+    def update_sound(self, state):
+        """Short beep each time a reading settles"""
+        stable = state[1]
+        if stable and not self._last_stable:
+            buzzer = self.devices["sound"]
+            with instrument.span("buzzer.pwm"):
+                buzzer.ChangeDutyCycle(50)
+            time.sleep(self.outputs["sound"]["beep"])  # Only this output's thread waits
+            with instrument.span("buzzer.pwm"):
+                buzzer.ChangeDutyCycle(0)
+        self._last_stable = stable
+
+    def reading(self):
+        """Latest weight and stability for the HTTP clients"""
+        weight, stable = self.detector.state
+        reading = {"weight": round(weight, 2), "stable": stable}
+        if self.multi is not None:
+            reading["channels"] = [round(w, 2) for w in self.multi.latest_weights().tolist()]
+        return reading
+
+    # ── Main Loop ──
+    def poll_jobs(self):
+        """Background jobs finish as soon as the readings are stable"""
+        # Poll every job (no short-circuit) so the channels of a bank settle side by side
+        if self.jobs and all([job.poll() for job in self.jobs]):
+            self.set_status("; ".join(job.message for job in self.jobs))
+            if self.multi is not None:
+                # Only channels that settled changed; an untared channel stays untared
+                self.calibration.save_scale(self.multi, channels=[job.channel for job in self.jobs if job.settled])
+            else:
+                self.calibration.save_hx711(self.hx)
+            self.detector.reset()
+            self.jobs = []
+        if self.zero_tracker is not None and self.zero_tracker.poll():
+            self.set_status(self.zero_tracker.message)
+            self.detector.reset()
+            self.calibration.save(offset=self.hx.get_offset())
+
+    def handle_key(self, key):
+        """Tare, calibration entry and quit; returns False to stop"""
+        if self.sampler is not None:
+            self.sampler.wake()
+        if self.entry is not None:
+            # Calibration: typing the known weight without blocking the display
+            if key in "0123456789." or (key == ":" and self.multi is not None):
+                self.entry += key
+            elif key in "\x7f\b":
+                self.entry = self.entry[:-1]
+            elif key == "\x1b":
+                self.entry = None
+                self.set_status("Calibration cancelled.")
+                return True
+            elif key in "\r\n":
+                self.calibrate(self.entry)
+                self.entry = None
+                return True
+            self.set_status(f"Known weight: {self.entry}_ g (Enter/Esc)")
+        elif key == 't':
+            if self.multi is not None:
+                self.tare_channels(range(self.multi.channels))
+            else:
+                calibration = self.config["calibration"]
+                self.jobs = [TareJob(self.sampler, window=calibration["stable_window"],
+                                     max_std=calibration["stable_std"])]
+                self.set_status("Taring...")
+        elif key == 'c':
+            # Place the weight, type it, press Enter
+            self.entry = ""
+            if self.multi is not None:
+                self.set_status("Place known weight on one cell, type channel:grams: _ (Enter/Esc)")
+            else:
+                self.set_status("Place known weight, type grams: _ (Enter/Esc)")
+        elif key == 'q':
+            print("\nShutting down...")
+            return False
+        return True
+
+    def calibrate(self, entry):
+        """Calibrate from the typed known weight ("channel:grams" for a bank)"""
+        channel, _, grams = entry.rpartition(":")
+        try:
+            known_weight = float(grams)
+            channel = int(channel) if channel else 0
+        except ValueError:
+            known_weight = 0.0
+        if known_weight <= 0 or (self.multi is not None and not 0 <= channel < self.multi.channels):
+            self.set_status("Invalid weight entered. Calibration cancelled.")
+            return
+        calibration = self.config["calibration"]
+        if self.multi is not None:
+            self.jobs = [ChannelCalibrationJob(self.multi, channel, known_weight, window=calibration["stable_window"],
+                                               max_std=calibration["stable_std"])]
+        else:
+            self.jobs = [CalibrationJob(self.sampler, known_weight, window=calibration["stable_window"],
+                                        max_std=calibration["stable_std"])]
+        self.set_status("Calibrating...")
+
+    def tare_channels(self, channels):
+        """Tare bank channels, each as soon as its own reading is stable"""
+        calibration = self.config["calibration"]
+        self.jobs = [ChannelTareJob(self.multi, channel, window=calibration["stable_window"],
+                                    max_std=calibration["stable_std"]) for channel in channels]
+        self.set_status("Taring...")
+
+    def run(self):
+        """Poll jobs and keys until [q] or Ctrl+C; sampling and rendering run on their own threads"""
+        key_poll = self.config["key_poll"]
+        try:
+            while True:
+                self.poll_jobs()
+                if not self.interactive:
+                    time.sleep(key_poll)
+                    continue
+                with instrument.span("main.key_wait"):
+                    pressed = select.select([sys.stdin], [], [], key_poll)[0]
+                if pressed and not self.handle_key(sys.stdin.read(1)):
+                    break
+        except KeyboardInterrupt:
+            print()
+
+    def stop(self):
+        self.scheduler.stop()
+        if self.server is not None:
+            self.server.stop()
+        frames = self.scheduler.stats()
+        self.scale.stop()
+        if self.logger is not None:
+            self.logger.stop()
+        self.profile.wait(timeout=5)
+        self.profile.stop_tracking()  # startup is over; shutdown imports do not belong in the report
+        if "neopixel" in self.devices:
+            self.devices["neopixel"].fill((0, 0, 0))  # Turn off NeoPixels
+            self.devices["neopixel"].show()
+        if "sound" in self.devices:
+            self.devices["sound"].stop()
+            devices.cleanup_gpio()
+        if "oled" in self.devices:
+            if self.oled_renderer is not None:  # None if the renderer failed after the device opened
+                self.oled_renderer.message((40, 50, "Goodbye!"))
+                time.sleep(1)
+            self.devices["oled"].cleanup()  # Clear display
+        if frames:
+            print("\nFrames drawn: " + ", ".join(f"{name} {stat['frames']}" for name, stat in frames.items()))
+        if self.sampler is not None:
+            power = self.sampler.power_stats()
+            print(f"HX711 at {self.sampler.rate():.0f} SPS, powered {power['powered_s']:.0f} s, "
+                  f"{power['sleeps']} sleeps, {power['discarded']} settling readings discarded")
+        if self.logger is not None:
+            print(f"Logged {self.logger.written} readings to {self.logger.directory} ({self.logger.dropped} dropped)")
+
+
+def main(config_path=None, description="Config-driven HX711 scale", started=None):
+    """Command-line entry point; scripts pass their default config file"""
+    started = started or time.monotonic()
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument("--config", default=config_path, help="JSON config (see runner.DEFAULT_CONFIG)")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="print per-import and per-device initialisation times")
+    args = parser.parse_args()
+    # Heavy modules (numpy, PIL, luma, neopixel, asyncio) are only imported by
+    # the output that needs them, on its own init thread
+    profile = StartupProfile(started, track_imports=args.profile_startup)
+    runner = Runner(load_config(args.config), profile)
+    runner.open_scale()
+
+    old_settings = None
+    signal.signal(signal.SIGTERM, signal.default_int_handler)  # stop cleanly as a service too
+    if runner.interactive:
+        fd = sys.stdin.fileno()
+        old_settings = termios.tcgetattr(fd)
+        tty.setcbreak(fd)
+    try:
+        runner.start()
+        runner.run()
+    finally:
+        if old_settings is not None:
+            termios.tcsetattr(fd, termios.TCSADRAIN, old_settings)
+        runner.stop()
+        if args.profile_startup:
+            print(profile.report())
+        instrument.report()
+        print("Goodbye!")
+
+
+if __name__ == "__main__":
+    main()
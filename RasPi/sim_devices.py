@@ -0,0 +1,228 @@
+import random
+import time
+
+# ┌──── Simulated Devices ────┐
+# Software stand-ins with the same methods the scripts call on the real
+# hardware objects, so everything can be imported, profiled and benchmarked
+# on machines without GPIO. All randomness comes from a seeded generator,
+# so a run with the same settings produces the same readings.
+
+
+class SimHX711:
+    """HX711 + load cell producing a synthetic signal with noise and drift
+
+    `signal` maps seconds since creation to grams on the scale. With
+    realtime=True reads wait for the next conversion like the real chip;
+    otherwise a virtual clock advances 1/rate per read.
+    """
+
+    def __init__(self, signal=None, reference_unit=210.0, offset=8_000, noise=0.5, drift=0.0,
+                 rate=80, realtime=True, seed=0, settle_samples=4):
+        self.signal = signal or (lambda t: 0.0)
+        self.true_reference_unit = reference_unit  # counts per gram of the simulated cell
+        self.true_offset = offset                  # counts with an empty scale
+        self.noise = noise                         # grams, standard deviation
+        self.drift = drift                         # grams per second
+        self.rate = rate                           # conversions per second (10 or 80)
+        self.realtime = realtime
+        self.random = random.Random(seed)
+        self.reference_unit = 1
+        self.offset = 0
+        self.powered = True
+        self.settle_samples = settle_samples       # readings that are off after power-up
+        self._settling = 0
+        self.reads = 0
+        self._start = time.monotonic()
+        self._virtual_time = 0.0
+        self._next_ready = self._start
+
+    # ── Configuration, as in the hx711 library ──
+    def set_reading_format(self, byte_format="MSB", bit_format="MSB"):
+        pass
+
+    def set_reference_unit(self, reference_unit):
+        self.reference_unit = reference_unit
+
+    def get_reference_unit(self):
+        return self.reference_unit
+
+    def set_offset(self, offset):
+        self.offset = offset
+
+    def get_offset(self):
+        return self.offset
+
+    def reset(self):
+        self.power_down()
+        self.power_up()
+
+    def power_down(self):
+        self.powered = False
+
+    def power_up(self):
+        if not self.powered:
+            self._settling = self.settle_samples
+        self.powered = True
+
+    def is_ready(self):
+        return not self.realtime or time.monotonic() >= self._next_ready
+
+    # ── Readings ──
+    def now(self):
+        """Seconds on the simulated clock"""
+        if self.realtime:
+            return time.monotonic() - self._start
+        return self._virtual_time
+
+    def read_long(self):
+        if self.realtime:
+            delay = self._next_ready - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            self._next_ready = max(self._next_ready, time.monotonic()) + 1.0 / self.rate
+        else:
+            self._virtual_time += 1.0 / self.rate
+        t = self.now()
+        grams = self.signal(t) + self.drift * t + self.random.gauss(0.0, self.noise)
+        if self._settling:
+            # Freshly powered up: the first conversions are far off
+            grams += 50.0 * self._settling
+            self._settling -= 1
+        self.reads += 1
+        return int(self.true_offset + grams * self.true_reference_unit)
+
+    def read_average(self, times=3):
+        return sum(self.read_long() for _ in range(times)) / times
+
+    def get_value(self, times=3):
+        return self.read_average(times) - self.offset
+
+    def get_weight(self, times=3):
+        return self.get_value(times) / self.reference_unit
+
+    def tare(self, times=15):
+        self.set_offset(self.read_average(times))
+
+
+class SimOLED:
+    """SH1107-style page-addressed panel that captures its framebuffer"""
+
+    def __init__(self, width=128, height=128, rotate=0):
+        self.width = width
+        self.height = height
+        self.size = (width, height)
+        self.mode = "1"
+        self.rotate = rotate
+        self.framebuffer = bytearray(width * height // 8)  # page-major, one byte per column
+        self.bytes_written = 0
+        self.transactions = 0
+        self._page = 0
+        self._column = 0
+
+    def preprocess(self, image):
+        from oled_renderer import rotate_frame  # PIL is only needed once frames are drawn
+        return rotate_frame(image, self.rotate, self.size)
+
+    def command(self, *cmd):
+        self.transactions += 1
+        for byte in cmd:
+            if byte & 0xF0 == 0xB0:
+                self._page = byte & 0x0F
+            elif byte & 0xF0 == 0x00:
+                self._column = (self._column & 0xF0) | (byte & 0x0F)
+            elif byte & 0xF0 == 0x10:
+                self._column = (self._column & 0x0F) | ((byte & 0x0F) << 4)
+
+    def data(self, data):
+        self.transactions += 1
+        start = self._page * self.width + self._column
+        self.framebuffer[start:start + len(data)] = bytes(data)
+        self._column += len(data)
+        self.bytes_written += len(data)
+
+    def display(self, image):
+        """Full-frame transfer, as luma's display() does"""
+        from oled_renderer import pack_pages
+        for page, data in enumerate(pack_pages(self.preprocess(image))):
+            self.command(0xB0 | page, 0x00, 0x10)
+            self.data(data)
+
+    def to_image(self):
+        """What the panel currently shows, before rotation"""
+        from PIL import Image
+        image = Image.new("1", self.size)
+        pixels = image.load()
+        for page in range(self.height // 8):
+            for x in range(self.width):
+                byte = self.framebuffer[page * self.width + x]
+                for bit in range(8):
+                    if byte & (1 << bit):
+                        pixels[x, page * 8 + bit] = 1
+        return image
+
+    def cleanup(self):
+        self.framebuffer[:] = bytes(len(self.framebuffer))
+
+
+class SimPixels:
+    """In-memory NeoPixel strip that counts the bytes sent to it"""
+
+    def __init__(self, num_pixels=30, brightness=1.0, bpp=3):
+        self.n = num_pixels
+        self.brightness = brightness
+        self.bpp = bpp
+        self.pin = None
+        self.pixels = [(0,) * bpp] * num_pixels
+        self.frame = bytearray(num_pixels * bpp)  # last bytes "on the wire"
+        self.bytes_written = 0
+        self.shows = 0
+
+    def __len__(self):
+        return self.n
+
+    def __setitem__(self, index, color):
+        self.pixels[index] = tuple(color)
+
+    def __getitem__(self, index):
+        return self.pixels[index]
+
+    def fill(self, color):
+        self.pixels = [tuple(color)] * self.n
+
+    def show(self):
+        self.write_frame(bytes(int(c * self.brightness) for pixel in self.pixels for c in pixel))
+
+    def write_frame(self, buf):
+        """Bulk write of a whole frame, used by pixel_engine.write_frame()"""
+        self.frame[:] = buf
+        self.bytes_written += len(buf)
+        self.shows += 1
+
+
+class SimPWM:
+    """RPi.GPIO PWM channel that records every change with its timestamp"""
+
+    def __init__(self, pin=12, frequency=440):
+        self.pin = pin
+        self.frequency = frequency
+        self.duty_cycle = 0
+        self.events = []  # (time.monotonic(), name, value)
+
+    def _record(self, name, value):
+        self.events.append((time.monotonic(), name, value))
+
+    def start(self, duty_cycle):
+        self.duty_cycle = duty_cycle
+        self._record("start", duty_cycle)
+
+    def stop(self):
+        self.duty_cycle = 0
+        self._record("stop", None)
+
+    def ChangeFrequency(self, frequency):
+        self.frequency = frequency
+        self._record("frequency", frequency)
+
+    def ChangeDutyCycle(self, duty_cycle):
+        self.duty_cycle = duty_cycle
+        self._record("duty_cycle", duty_cycle)
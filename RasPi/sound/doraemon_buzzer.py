@@ -1,36 +1,47 @@
-import RPi.GPIO as GPIO
+import os
+import sys
 import time
-from doraemon import melody, REST, tempo
+import doraemon
+from melody_compiler import load_schedule
+
+# Shared helpers (devices.py) live one directory up in RasPi/
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import devices
+import instrument
+from instrument import span
 
 # --- Buzzer Setup ---
 BUZZER_PIN = 12
-GPIO.setwarnings(False)
-GPIO.setmode(GPIO.BCM)
-GPIO.setup(BUZZER_PIN, GPIO.OUT)
-pwm = GPIO.PWM(BUZZER_PIN, 440)
+pwm = devices.open_buzzer(BUZZER_PIN, 440)  # RASPI_BACKEND=sim records instead of playing
 
 # --- Timing ---
-whole_note_duration = (60 / tempo) * 4
+TICKS_PER_SECOND = 1000  # Schedule resolution: milliseconds
+schedule = load_schedule(doraemon, TICKS_PER_SECOND)
+
+def wait_until(deadline):
+    delay = deadline - time.monotonic()
+    if delay > 0:
+        time.sleep(delay)
+    instrument.observe("buzzer.late", time.monotonic() - deadline)  # sleep overshoot
 
-def play_tone(frequency, duration_sec):
-    if frequency == REST:
-        pwm.ChangeDutyCycle(0)
-        time.sleep(duration_sec)
-    else:
-        pwm.ChangeFrequency(frequency)
-        pwm.ChangeDutyCycle(50)
-        time.sleep(duration_sec)
-        pwm.ChangeDutyCycle(0)
-        time.sleep(0.02)
+def play_schedule(schedule):
+    # Every note is timed from the same start, so sleep overshoot never accumulates
+    start = time.monotonic()
+    for frequency, note_start, gate in zip(schedule.frequency, schedule.start, schedule.gate):
+        wait_until(start + schedule.seconds(note_start))
+        if frequency:
+            with span("buzzer.pwm"):
+                pwm.ChangeFrequency(frequency)
+                pwm.ChangeDutyCycle(50)
+            wait_until(start + schedule.seconds(note_start + gate))
+            with span("buzzer.pwm"):
+                pwm.ChangeDutyCycle(0)
+    wait_until(start + schedule.seconds(schedule.total))
 
 try:
     pwm.start(0)
-    for note, divider in melody:
-        duration = whole_note_duration / abs(divider)
-        if divider < 0:
-            duration *= 1.5
-        play_tone(note, duration * 0.9)
-        time.sleep(duration * 0.1)
+    play_schedule(schedule)
 finally:
     pwm.stop()
-    GPIO.cleanup()
+    instrument.report()
+    devices.cleanup_gpio()
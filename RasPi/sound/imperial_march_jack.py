@@ -1,56 +1,56 @@
+import os
+import sys
 import time
-import numpy as np
 import pygame
-from imperial_march import melody, REST, tempo
+
+# Shared helpers (instrument.py) live one directory up in RasPi/
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import instrument
+import imperial_march
+from melody_compiler import load_schedule
+from melody_render import render_schedule
+from synth import Mixer, Voice, stream
 
 # --- Constants ---
 SAMPLE_RATE = 44100
 VOLUME = 0.5
-whole_note_duration = (60 / tempo) * 4
+PAUSE_BETWEEN_LOOPS = 10  # Seconds of silence before the melody repeats
+BLOCK_SIZE = 512          # Samples per block in --stream mode
 
 # pygame.mixer.init() will be called in the main execution block
 
-def play_tone(frequency, duration_sec):
-    if frequency == REST:
-        time.sleep(duration_sec)
-        return
-    
-    if duration_sec <= 0: # Prevent issues with zero or negative duration
-        return
-
-    num_samples = int(SAMPLE_RATE * duration_sec)
-    if num_samples == 0: # If duration is too short for any samples
-        time.sleep(duration_sec) # Still respect the intended rest duration
-        return
-
-    t = np.linspace(0, duration_sec, num_samples, False)
-    wave = np.sin(frequency * 2 * np.pi * t)
-    audio = np.ascontiguousarray((wave * 32767 * VOLUME).astype(np.int16))
-    sound = pygame.sndarray.make_sound(audio)
-    sound.play() # Play the sound once
-    time.sleep(duration_sec) # Allow the sound to play for its duration
-
 def play_melody():
     print("Playing Doraemon theme song... Press Ctrl+C to stop")
+    # The whole melody, staccato gaps and the pause are rendered once into one buffer
+    audio = render_schedule(load_schedule(imperial_march, SAMPLE_RATE), VOLUME, tail=PAUSE_BETWEEN_LOOPS)
+    sound = pygame.sndarray.make_sound(audio)
     try:
+        sound.play(loops=-1)  # Sample-accurate repeats, no per-note timing in Python
         while True:
-            for note, divider in melody:
-                duration = whole_note_duration / abs(divider)
-                if divider < 0: # Dotted note
-                    duration *= 1.5
-            
-                # Play the note for 90% of its duration
-                play_tone(note, duration * 0.9)
-                # Rest for the remaining 10% (staccato effect)
-                time.sleep(duration * 0.1)
-            time.sleep(10) # Pause 10 seconds before repeating
+            time.sleep(1)
             
     except KeyboardInterrupt:
+        sound.stop()
         print("\nPlayback stopped by user.")
 
+def stream_melody():
+    print("Playing Doraemon theme song... Press Ctrl+C to stop")
+    # Streaming mode: blocks are synthesised just ahead of playback with ADSR envelopes
+    mixer = Mixer(BLOCK_SIZE, VOLUME)
+    # Same pause between loops as the pre-rendered buffer, as a trailing rest
+    mixer.add(Voice(load_schedule(imperial_march, SAMPLE_RATE).add_rest(PAUSE_BETWEEN_LOOPS)))
+    try:
+        stream(mixer)
+    except KeyboardInterrupt:
+        print(f"\nPlayback stopped by user. Buffer underruns: {mixer.underruns}")
+
 if __name__ == "__main__":
     pygame.mixer.init(frequency=SAMPLE_RATE, size=-16, channels=1, buffer=512)
     try:
-        play_melody()
+        if "--stream" in sys.argv:
+            stream_melody()
+        else:
+            play_melody()
     finally:
-        pygame.mixer.quit()
\ No newline at end of file
+        pygame.mixer.quit()
+        instrument.report()
\ No newline at end of file
@@ -0,0 +1,100 @@
+import hashlib
+import os
+import pickle
+from array import array
+
+# ┌──── Melody Compiler ────┐
+# Melody modules (doraemon.py, imperial_march.py) list notes as
+# (frequency, divider) with negative dividers for dotted notes. The compiler
+# resolves that once into a Schedule: flat arrays of absolute start times,
+# note lengths and sounding (gate) lengths in ticks, where a tick is one
+# sample for audio players or e.g. one millisecond for the buzzer. Players
+# then wait for absolute deadlines instead of adding up sleep() calls.
+#
+# A module may also define `tempo_changes = {note_index: bpm}`.
+# Compiled schedules are cached in __pycache__ next to the melody module.
+
+STACCATO = 0.9  # fraction of each note that sounds; the rest is silence
+
+
+def note_durations(melody, tempo, tempo_changes=None):
+    """(frequency, seconds) per note; negative dividers are dotted notes"""
+    tempo_changes = tempo_changes or {}
+    for i, (note, divider) in enumerate(melody):
+        tempo = tempo_changes.get(i, tempo)
+        whole_note_duration = (60 / tempo) * 4
+        duration = whole_note_duration / abs(divider)
+        if divider < 0:  # Dotted note
+            duration *= 1.5
+        yield note, duration
+
+
+class Schedule:
+    """Compiled melody: per-note frequency, start, length and gate in ticks"""
+
+    def __init__(self, rate):
+        self.rate = rate                  # ticks per second
+        self.frequency = array("d")       # Hz, 0.0 for rests
+        self.start = array("q")           # absolute start tick
+        self.length = array("q")          # ticks until the next note starts
+        self.gate = array("q")            # ticks the note sounds
+        self.total = 0                    # ticks in the whole melody
+
+    def __len__(self):
+        return len(self.frequency)
+
+    def seconds(self, ticks):
+        return ticks / self.rate
+
+    def add_rest(self, seconds):
+        """Append a rest, e.g. the pause before a looping player repeats the melody"""
+        ticks = int(round(seconds * self.rate))
+        if ticks > 0:
+            self.frequency.append(0.0)
+            self.start.append(self.total)
+            self.length.append(ticks)
+            self.gate.append(0)
+            self.total += ticks
+        return self
+
+
+def compile_melody(melody, tempo, rate=44100, rest=0, tempo_changes=None):
+    """Resolve a (frequency, divider) melody into a Schedule at `rate` ticks/s"""
+    schedule = Schedule(rate)
+    start = 0.0
+    for note, duration in note_durations(melody, tempo, tempo_changes):
+        # Rounding absolute times (not lengths) keeps rounding error from accumulating
+        first = int(round(start * rate))
+        schedule.frequency.append(0.0 if note == rest else float(note))
+        schedule.start.append(first)
+        schedule.gate.append(int(round((start + duration * STACCATO) * rate)) - first)
+        start += duration
+        schedule.length.append(int(round(start * rate)) - first)
+    schedule.total = int(round(start * rate))
+    return schedule
+
+
+def load_schedule(module, rate=44100):
+    """Compiled schedule for a melody module, reusing the on-disk cache when valid"""
+    tempo_changes = getattr(module, "tempo_changes", None)
+    key = hashlib.sha1(repr((module.melody, module.tempo, tempo_changes, module.REST, rate)).encode()).hexdigest()
+    cache_dir = os.path.join(os.path.dirname(os.path.abspath(module.__file__)), "__pycache__")
+    name = module.__name__.rsplit(".", 1)[-1]
+    path = os.path.join(cache_dir, f"{name}.{rate}.schedule")
+    try:
+        with open(path, "rb") as f:
+            cached_key, schedule = pickle.load(f)
+        if cached_key == key:
+            return schedule
+    except (OSError, EOFError, pickle.UnpicklingError, ValueError):
+        pass
+
+    schedule = compile_melody(module.melody, module.tempo, rate, module.REST, tempo_changes)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        with open(path + ".tmp", "wb") as f:
+            pickle.dump((key, schedule), f)
+        os.replace(path + ".tmp", path)
+    except OSError:
+        pass  # read-only install: just compile every time
+    return schedule
@@ -0,0 +1,34 @@
+from functools import lru_cache
+import numpy as np
+from melody_compiler import compile_melody
+
+# ┌──── Melody Renderer ────┐
+# Turns a compiled melody schedule into one contiguous int16 buffer that
+# pygame plays as a single Sound. Each note sounds for 90% of its length and
+# is followed by 10% silence (staccato), exactly as the players did with
+# time.sleep, but note starts are the schedule's absolute sample positions
+# so timing cannot drift. A tone for a given frequency and length is only
+# synthesised once, however often it occurs in the melody.
+
+
+@lru_cache(maxsize=None)
+def tone(frequency, num_samples, sample_rate, volume):
+    """Sine tone as int16 samples; cached and read-only"""
+    t = np.arange(num_samples) / sample_rate
+    audio = (np.sin(frequency * 2 * np.pi * t) * 32767 * volume).astype(np.int16)
+    audio.flags.writeable = False
+    return audio
+
+
+def render_schedule(schedule, volume=0.5, tail=0.0):
+    """Whole schedule (ticks = samples) as one int16 buffer plus `tail` seconds of silence"""
+    buffer = np.zeros(schedule.total + int(round(tail * schedule.rate)), dtype=np.int16)
+    for frequency, start, gate in zip(schedule.frequency, schedule.start, schedule.gate):
+        if frequency:
+            buffer[start:start + gate] = tone(frequency, gate, schedule.rate, volume)
+    return buffer
+
+
+def render_melody(melody, tempo, sample_rate=44100, volume=0.5, rest=0, tail=0.0):
+    """Compile and render a (frequency, divider) melody in one step"""
+    return render_schedule(compile_melody(melody, tempo, sample_rate, rest), volume, tail)
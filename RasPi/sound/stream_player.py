@@ -0,0 +1,72 @@
+import argparse
+import importlib
+import os
+import sys
+import threading
+import time
+import pygame
+
+# Shared helpers (instrument.py) live one directory up in RasPi/
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import instrument
+from melody_compiler import load_schedule
+from synth import Mixer, Voice, stream
+
+# ┌──── Layered Stream Player ────┐
+# Plays several melody modules through the streaming synth at once:
+#
+#   python3 stream_player.py doraemon imperial_march              # layered
+#   python3 stream_player.py doraemon imperial_march --crossfade 15
+#
+# With --crossfade the songs take turns, fading over --fade seconds every
+# --crossfade seconds. The buffer underrun count is printed as it changes,
+# which is what to watch when tuning --block for latency.
+
+SAMPLE_RATE = 44100
+VOLUME = 0.4
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Layer or crossfade melodies with the streaming synth")
+    parser.add_argument("songs", nargs="+", help="melody modules, e.g. doraemon imperial_march")
+    parser.add_argument("--block", type=int, default=512, help="samples per audio block")
+    parser.add_argument("--crossfade", type=float, default=0, help="seconds per song before fading to the next (0 = layer all)")
+    parser.add_argument("--fade", type=float, default=2.0, help="length of a crossfade in seconds")
+    args = parser.parse_args()
+
+    pygame.mixer.init(frequency=SAMPLE_RATE, size=-16, channels=1, buffer=args.block)
+    mixer = Mixer(args.block, VOLUME / len(args.songs) if not args.crossfade else VOLUME)
+    for i, name in enumerate(args.songs):
+        song = importlib.import_module(name)
+        gain = 1.0 if not args.crossfade or i == 0 else 0.0
+        mixer.add(Voice(load_schedule(song, SAMPLE_RATE), gain=gain))
+
+    done = threading.Event()
+    player = threading.Thread(target=stream, args=(mixer,), kwargs={"stop": done.is_set}, daemon=True)
+    player.start()
+    print(f"Streaming {', '.join(args.songs)}... Press Ctrl+C to stop")
+    current = 0
+    next_fade = time.monotonic() + args.crossfade
+    reported = 0
+    try:
+        while player.is_alive():
+            time.sleep(0.1)
+            if args.crossfade and time.monotonic() >= next_fade:
+                mixer.voices[current].fade_to(0.0, args.fade)
+                current = (current + 1) % len(mixer.voices)
+                mixer.voices[current].fade_to(1.0, args.fade)
+                next_fade += args.crossfade
+            if mixer.underruns != reported:
+                reported = mixer.underruns
+                print(f"Buffer underruns: {reported}")
+    except KeyboardInterrupt:
+        print(f"\nPlayback stopped by user. Buffer underruns: {mixer.underruns}")
+    finally:
+        done.set()
+        player.join(timeout=1)
+        pygame.mixer.quit()
+        instrument.report()  # RASPI_INSTRUMENT=1: where the time went
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+import time
+import numpy as np
+import pygame
+from instrument import span, count
+
+# ┌──── Streaming Synth ────┐
+# Instead of one Sound per note, audio is produced in small fixed-size
+# blocks: Mixer.fill() is called every time the output needs another block
+# and mixes any number of voices into it. Each voice reads a precomputed
+# sine wavetable through a phase accumulator (so the phase carries on
+# smoothly from note to note) and shapes every note with an ADSR envelope
+# to avoid clicks. Memory stays at a few blocks however long the song is.
+
+TABLE_SIZE = 2048
+WAVETABLE = np.sin(2 * np.pi * np.arange(TABLE_SIZE) / TABLE_SIZE).astype(np.float32)
+
+
+class Voice:
+    """One compiled melody (ticks = samples) played from the wavetable, note by note"""
+
+    def __init__(self, schedule, gain=1.0, loop=True, attack=0.005, decay=0.02, sustain=0.8, release=0.015):
+        self.schedule = schedule
+        sample_rate = schedule.rate
+        self.sample_rate = sample_rate
+        self.loop = loop
+        self.gain = gain
+        self.target_gain = gain
+        self.gain_step = 0.0
+        # Attack/decay breakpoints in samples, release length in samples
+        self._adsr_x = [0, max(1, int(attack * sample_rate)), max(2, int((attack + decay) * sample_rate))]
+        self._adsr_y = [0.0, 1.0, sustain]
+        self.release = max(1, int(release * sample_rate))
+        self.phase = 0.0                   # position in the wavetable
+        self.note = 0
+        self.position = 0                  # samples into the current note
+        self.finished = False
+
+    def fade_to(self, gain, seconds):
+        """Ramp the voice gain linearly, e.g. for crossfades"""
+        self.target_gain = gain
+        self.gain_step = (gain - self.gain) / max(1, int(seconds * self.sample_rate))
+
+    def _envelope(self, t, gate):
+        # ADSR level at sample offsets `t` (ascending) of a note held for `gate` samples
+        level = np.interp(np.minimum(t, gate), self._adsr_x, self._adsr_y)
+        if t[-1] > gate:
+            level *= np.clip(1.0 - (t - gate) / self.release, 0.0, 1.0)
+        return level
+
+    def render(self, out, scratch, ramp):
+        """Add this voice into float32 `out`; `scratch`/`ramp` are work buffers"""
+        done = 0
+        while done < len(out) and not self.finished:
+            schedule = self.schedule
+            length = schedule.length[self.note]
+            count = min(len(out) - done, length - self.position)
+            frequency = schedule.frequency[self.note]
+            if frequency:
+                step = frequency * TABLE_SIZE / self.sample_rate
+                index = scratch[:count]
+                np.multiply(ramp[:count], step, out=index)
+                index += self.phase
+                np.mod(index, TABLE_SIZE, out=index)
+                wave = WAVETABLE[index.astype(np.intp)]
+                wave *= self._envelope(ramp[:count] + self.position, schedule.gate[self.note])
+                wave *= self.gain
+                out[done:done + count] += wave
+                self.phase = (self.phase + step * count) % TABLE_SIZE
+            done += count
+            self.position += count
+            if self.position >= length:
+                self.position = 0
+                self.note += 1
+                if self.note == len(schedule):
+                    self.note = 0
+                    self.finished = not self.loop
+        if self.gain_step:
+            self.gain += self.gain_step * len(out)
+            if (self.gain_step > 0) == (self.gain >= self.target_gain):
+                self.gain, self.gain_step = self.target_gain, 0.0
+
+
+class Mixer:
+    """Mix voices into fixed-size int16 blocks"""
+
+    def __init__(self, block_size=512, volume=0.5):
+        self.block_size = block_size
+        self.volume = volume
+        self.voices = []
+        self.underruns = 0      # blocks that arrived after the output had run dry
+        self._mix = np.zeros(block_size, dtype=np.float32)
+        self._scratch = np.zeros(block_size, dtype=np.float32)
+        self._ramp = np.arange(block_size, dtype=np.float32)
+
+    def add(self, voice):
+        self.voices.append(voice)
+        return voice
+
+    def fill(self, out):
+        """Audio callback: write the next block into int16 array `out`"""
+        with span("synth.fill"):
+            mix = self._mix
+            mix.fill(0.0)
+            for voice in self.voices:
+                voice.render(mix, self._scratch, self._ramp)
+            mix *= 32767 * self.volume
+            np.clip(mix, -32768, 32767, out=mix)
+            out[:] = mix
+
+
+def stream(mixer, channel=None, buffers=3, stop=None):
+    """Feed the mixer to a pygame channel block by block until `stop()` is true
+
+    Blocks are written in place into a small ring of Sounds: one playing, one
+    queued, the rest being filled. Every time the channel has run dry before
+    the next block is queued, mixer.underruns goes up; raise the block size
+    until it stays at zero.
+    """
+    sounds = [pygame.mixer.Sound(buffer=bytes(2 * mixer.block_size)) for _ in range(buffers)]
+    blocks = [pygame.sndarray.samples(sound) for sound in sounds]  # views into the Sounds
+    channel = channel or pygame.mixer.find_channel(True)
+    block_time = mixer.block_size / pygame.mixer.get_init()[0]
+    current = 0
+    mixer.fill(blocks[current])
+    channel.play(sounds[current])
+    while stop is None or not stop():
+        if channel.get_queue() is not None:
+            with span("synth.wait"):
+                time.sleep(block_time / 4)
+            continue
+        if not channel.get_busy():
+            mixer.underruns += 1
+            count("synth.underruns")
+        current = (current + 1) % buffers
+        mixer.fill(blocks[current])
+        channel.queue(sounds[current])
+        if all(voice.finished for voice in mixer.voices):
+            break
@@ -0,0 +1,106 @@
+import builtins
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+# ┌──── Startup Profile ────┐
+# Helps the scripts show a first reading early: slow subsystems (OLED fonts,
+# numpy tables, I2C/SPI handshakes) are initialised on their own threads with
+# start() while the HX711 is already sampling, and their outputs are attached
+# as each one finishes. Every step, and optionally every top-level import, is
+# timed against the moment the script started; report() prints the timeline
+# for --profile-startup.
+
+
+class StartupProfile:
+    """Timeline of imports and initialisation steps since `started`"""
+
+    def __init__(self, started=None, track_imports=False):
+        self.started = started or time.monotonic()
+        self.steps = []        # (name, start offset, seconds, thread)
+        self.marks = []        # (name, offset)
+        self.imports = []      # (module, seconds, thread), outermost imports only
+        self.threads = {}
+        self.lock = threading.Lock()
+        self._local = threading.local()
+        self._import = None
+        if track_imports:
+            self._import = builtins.__import__
+            builtins.__import__ = self._timed_import
+
+    def _timed_import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        if level or name in sys.modules:
+            return self._import(name, globals, locals, fromlist, level)
+        depth = getattr(self._local, "depth", 0)
+        self._local.depth = depth + 1
+        started = time.perf_counter()
+        try:
+            return self._import(name, globals, locals, fromlist, level)
+        finally:
+            self._local.depth = depth
+            if depth == 0:
+                with self.lock:
+                    self.imports.append((name, time.perf_counter() - started, threading.current_thread().name))
+
+    def stop_tracking(self):
+        if self._import is not None:
+            builtins.__import__ = self._import
+            self._import = None
+
+    # ── Steps ──
+    def elapsed(self):
+        return time.monotonic() - self.started
+
+    def mark(self, name):
+        """Record a moment such as the first reading"""
+        with self.lock:
+            self.marks.append((name, self.elapsed()))
+
+    @contextmanager
+    def step(self, name):
+        offset = self.elapsed()
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            with self.lock:
+                self.steps.append((name, offset, time.perf_counter() - started, threading.current_thread().name))
+
+    def start(self, name, init, done=None):
+        """Run init() on its own thread; done(name, error) is called there when it returns"""
+        def run():
+            error = None
+            try:
+                with self.step(name):
+                    init()
+            except Exception as e:
+                error = e
+            if done is not None:
+                done(name, error)
+
+        thread = threading.Thread(target=run, name=f"init-{name}", daemon=True)
+        self.threads[name] = thread
+        thread.start()
+        return thread
+
+    def wait(self, timeout=None):
+        """Wait for every start()ed step to finish"""
+        for thread in self.threads.values():
+            thread.join(timeout)
+
+    # ── Report ──
+    def report(self, imports=12):
+        lines = ["Startup profile (seconds since start)"]
+        for name, offset in sorted(self.marks, key=lambda m: m[1]):
+            lines.append(f"  {offset:7.3f}  {name}")
+        lines.append("  Initialisation:")
+        for name, offset, seconds, thread in sorted(self.steps, key=lambda s: s[1]):
+            lines.append(f"    {name:<20} at {offset:6.3f}  took {seconds:6.3f}  [{thread}]")
+        if self.imports:
+            slowest = sorted(self.imports, key=lambda i: -i[1])[:imports]
+            total = sum(seconds for _, seconds, _ in self.imports)
+            lines.append(f"  Imports ({total:.3f} s in total, slowest first):")
+            for module, seconds, thread in slowest:
+                lines.append(f"    {module:<28} {seconds:6.3f}  [{thread}]")
+        return "\n".join(lines)
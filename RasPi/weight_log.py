@@ -0,0 +1,287 @@
+import glob
+import os
+import threading
+import time
+import numpy as np
+
+# ┌──── Weight Log ────┐
+# Appends every sample of an HX711Sampler to fixed-size binary records so a
+# day of readings can be analysed later without parsing text. The logger
+# thread reads the sampler's ring buffer the same way the calibration jobs
+# do, so acquisition never waits for the SD card: every `flush_interval`
+# seconds the new slots are copied into one reused numpy batch and written
+# with a single write() call.
+#
+#   <dir>/weights-YYYYmmdd-HHMMSS.bin   RECORD per sample, one file per segment
+#   <dir>/rollup-1s.bin, rollup-60s.bin ROLLUP per second / minute
+#
+# Files have no header, so read_segment() and read_rollup() can hand out
+# np.memmap views directly. Times are Unix seconds (UTC). A power cut can
+# at most leave a partial last record: the readers ignore it, and the
+# logger cuts it off before appending so later records stay aligned.
+#
+# fsync policy: "always" after every batch, "interval" every
+# `fsync_interval` seconds, "never" leaves it to the kernel.
+
+RECORD = np.dtype([("time", "<f8"), ("raw", "<i4"), ("weight", "<f4")])
+ROLLUP = np.dtype([("time", "<f8"), ("min", "<f4"), ("max", "<f4"), ("mean", "<f4"), ("count", "<u4")])
+FSYNC_POLICIES = ("never", "interval", "always")
+ROLLUP_PERIODS = (1, 60)  # seconds
+
+
+class Rollup:
+    """Min/max/mean per `period` seconds, extended one batch at a time"""
+
+    def __init__(self, period):
+        self.period = period
+        self.bucket = None      # bucket still open, as time // period
+        self.min = 0.0
+        self.max = 0.0
+        self.total = 0.0
+        self.count = 0
+
+    def add(self, times, values):
+        """Fold in a batch of samples; returns ROLLUP records for buckets that closed"""
+        if len(times) == 0:
+            return np.empty(0, ROLLUP)
+        buckets = (times // self.period).astype(np.int64)
+        starts = np.concatenate(([0], np.flatnonzero(np.diff(buckets)) + 1))
+        groups = buckets[starts]
+        mins = np.minimum.reduceat(values, starts).astype(np.float64)
+        maxs = np.maximum.reduceat(values, starts).astype(np.float64)
+        totals = np.add.reduceat(values.astype(np.float64), starts)
+        counts = np.diff(np.append(starts, len(values)))
+        closed = []
+        if self.bucket == groups[0]:
+            # The batch continues the bucket left open by the previous batch
+            mins[0] = min(mins[0], self.min)
+            maxs[0] = max(maxs[0], self.max)
+            totals[0] += self.total
+            counts[0] += self.count
+        elif self.bucket is not None:
+            closed.append(self._record())
+        for i in range(len(groups) - 1):
+            closed.append((groups[i] * self.period, mins[i], maxs[i], totals[i] / counts[i], counts[i]))
+        self.bucket = groups[-1]
+        self.min, self.max, self.total, self.count = mins[-1], maxs[-1], totals[-1], counts[-1]
+        return np.array(closed, dtype=ROLLUP)
+
+    def close(self):
+        """Records for the bucket still open, e.g. at shutdown"""
+        if self.bucket is None:
+            return np.empty(0, ROLLUP)
+        record = np.array([self._record()], dtype=ROLLUP)
+        self.bucket = None
+        return record
+
+    def _record(self):
+        return (self.bucket * self.period, self.min, self.max, self.total / self.count, self.count)
+
+
+class WeightLogger:
+    """Log every sample of an HX711Sampler to rotating binary segments"""
+
+    def __init__(self, sampler, directory, flush_interval=1.0, fsync="interval", fsync_interval=10.0,
+                 segment_seconds=3600, max_segments=None, rollup_periods=ROLLUP_PERIODS):
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"Unknown fsync policy {fsync!r}; choose from {', '.join(FSYNC_POLICIES)}")
+        self.sampler = sampler
+        self.directory = directory
+        self.flush_interval = flush_interval    # seconds between batches
+        self.fsync = fsync
+        self.fsync_interval = fsync_interval    # seconds, for fsync="interval"
+        self.segment_seconds = segment_seconds  # start a new segment file this often
+        self.max_segments = max_segments        # delete the oldest beyond this; None = keep all
+        self.rollups = [Rollup(period) for period in rollup_periods]
+        self.written = 0                        # samples written
+        self.dropped = 0                        # samples overwritten in the ring before we got them
+        self.batches = 0
+        self.fsyncs = 0
+        self.write_time = 0.0                   # seconds spent in write()/fsync()
+        self.next_sample = sampler.count
+        # Sampler timestamps are time.monotonic(); the log stores wall-clock time
+        self.clock_offset = time.time() - time.monotonic()
+        self._times = np.frombuffer(sampler.times, dtype=np.float64)
+        self._raw = np.frombuffer(sampler.raw, dtype=np.int64)
+        self._weights = np.frombuffer(sampler.filtered_weights, dtype=np.float64)
+        self._batch = np.empty(sampler.size, RECORD)  # reused for every write
+        self._segment = None
+        self._segment_started = 0.0
+        self._rollup_files = {}
+        self._last_fsync = time.monotonic()
+        self._stop = threading.Event()
+        self._thread = None
+        os.makedirs(directory, exist_ok=True)
+
+    # ── Lifecycle ──
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="weight-log", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.flush_interval):
+            self.drain()
+        self.drain()
+        self.close()
+
+    # ── Writing ──
+    def drain(self):
+        """Write every sample taken since the last call; returns how many"""
+        sampler = self.sampler
+        count = sampler.count
+        start = max(self.next_sample, count - sampler.size)
+        n = count - start
+        self.dropped += start - self.next_sample
+        self.next_sample = count
+        if n == 0:
+            return 0
+        slots = np.arange(start, count) % sampler.size
+        batch = self._batch[:n]
+        batch["time"] = self._times[slots] + self.clock_offset
+        batch["raw"] = self._raw[slots]
+        batch["weight"] = self._weights[slots]
+        # Slots the sampler refilled while we copied hold newer samples: drop them
+        overwritten = sampler.count - sampler.size - start
+        if overwritten > 0:
+            batch = batch[overwritten:]
+            self.dropped += overwritten
+        self._write(batch)
+        return len(batch)
+
+    def _write(self, batch):
+        started = time.perf_counter()
+        now = time.monotonic()
+        if self._segment is None or now - self._segment_started >= self.segment_seconds:
+            self._rotate(batch["time"][0])
+        self._segment.write(batch.tobytes())
+        for rollup in self.rollups:
+            closed = rollup.add(batch["time"], batch["weight"])
+            if len(closed):
+                self._rollup_file(rollup.period).write(closed.tobytes())
+        if self.fsync == "always" or (self.fsync == "interval" and now - self._last_fsync >= self.fsync_interval):
+            self._sync()
+        self.written += len(batch)
+        self.batches += 1
+        self.write_time += time.perf_counter() - started
+
+    def _rotate(self, first_time):
+        if self._segment is not None:
+            self._close_file(self._segment)
+        name = time.strftime("weights-%Y%m%d-%H%M%S.bin", time.gmtime(first_time))
+        # Unbuffered: each batch is already one write() call
+        self._segment = _open_records(os.path.join(self.directory, name), RECORD)
+        self._segment_started = time.monotonic()
+        if self.max_segments is not None:
+            for path in segments(self.directory)[:-self.max_segments]:
+                os.remove(path)
+
+    def _rollup_file(self, period):
+        if period not in self._rollup_files:
+            path = os.path.join(self.directory, f"rollup-{period}s.bin")
+            self._rollup_files[period] = _open_records(path, ROLLUP)
+        return self._rollup_files[period]
+
+    def _sync(self):
+        for f in [self._segment, *self._rollup_files.values()]:
+            if f is not None:
+                os.fsync(f.fileno())
+        self._last_fsync = time.monotonic()
+        self.fsyncs += 1
+
+    def _close_file(self, f):
+        if self.fsync != "never":
+            os.fsync(f.fileno())
+        f.close()
+
+    def close(self):
+        """Write the open rollup buckets and close every file"""
+        for rollup in self.rollups:
+            record = rollup.close()
+            if len(record):
+                self._rollup_file(rollup.period).write(record.tobytes())
+        for f in [self._segment, *self._rollup_files.values()]:
+            if f is not None:
+                self._close_file(f)
+        self._segment = None
+        self._rollup_files = {}
+
+    def stats(self):
+        return {
+            "written": self.written,
+            "dropped": self.dropped,
+            "batches": self.batches,
+            "fsyncs": self.fsyncs,
+            "mean_write_ms": 1000 * self.write_time / self.batches if self.batches else 0.0,
+        }
+
+
+# ┌──── Reading ────┐
+def segments(directory):
+    """Segment files, oldest first"""
+    return sorted(glob.glob(os.path.join(directory, "weights-*.bin")))
+
+
+def _open_records(path, dtype):
+    """Open a record file for appending, dropping a partial record left by a power cut"""
+    f = open(path, "ab", buffering=0)
+    size = os.fstat(f.fileno()).st_size
+    if size % dtype.itemsize:
+        os.ftruncate(f.fileno(), size - size % dtype.itemsize)
+    return f
+
+
+def _memmap(path, dtype):
+    records = os.path.getsize(path) // dtype.itemsize  # ignore a partly written last record
+    if records == 0:
+        return np.empty(0, dtype)
+    return np.memmap(path, dtype=dtype, mode="r", shape=(records,))
+
+
+def read_segment(path):
+    """Zero-copy, read-only view of one segment's RECORDs"""
+    return _memmap(path, RECORD)
+
+
+def read_rollup(directory, period=60):
+    """Zero-copy, read-only view of the ROLLUPs for `period` seconds"""
+    path = os.path.join(directory, f"rollup-{period}s.bin")
+    if not os.path.exists(path):
+        return np.empty(0, ROLLUP)
+    return _memmap(path, ROLLUP)
+
+
+def read_range(directory, start=None, end=None):
+    """RECORDs with start <= time < end from every segment (a copy)"""
+    parts = []
+    for path in segments(directory):
+        records = read_segment(path)
+        if len(records) == 0:
+            continue
+        lo = 0 if start is None else np.searchsorted(records["time"], start)
+        hi = len(records) if end is None else np.searchsorted(records["time"], end)
+        if lo < hi:
+            parts.append(records[lo:hi])
+    return np.concatenate(parts) if parts else np.empty(0, RECORD)
+
+
+if __name__ == "__main__":
+    import sys
+
+    directory = sys.argv[1] if len(sys.argv) > 1 else "."
+    for path in segments(directory):
+        records = read_segment(path)
+        if len(records):
+            span = records["time"][-1] - records["time"][0]
+            print(f"{os.path.basename(path)}: {len(records)} samples over {span:.0f} s")
+    minutes = read_rollup(directory, 60)
+    for record in minutes[-10:]:
+        stamp = time.strftime("%Y-%m-%d %H:%M", time.gmtime(record["time"]))
+        print(f"{stamp}  min {record['min']:8.2f}  max {record['max']:8.2f}  mean {record['mean']:8.2f}  n={record['count']}")
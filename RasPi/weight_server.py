@@ -0,0 +1,290 @@
+import asyncio
+import base64
+import hashlib
+import json
+import struct
+import threading
+import time
+
+# ┌──── Weight Server ────┐
+# Optional HTTP endpoint publishing the live weight to browsers and scripts:
+#
+#   GET /            tiny live page (uses /events)
+#   GET /weight      JSON snapshot {"weight", "stable", "time", "seq"}
+#   GET /events      Server-Sent Events, one "data:" line per update
+#   GET /ws          WebSocket, one text message per update
+#
+# The server runs its own asyncio loop on its own thread. notify() may be
+# called from any thread (e.g. as a ChangeDetector subscriber); updates are
+# rate limited to `max_rate` per second and each is JSON-encoded and framed
+# for SSE and WebSocket exactly once, however many clients are connected.
+# Every client holds only the newest frame not yet sent: a slow client skips
+# updates (counted in `dropped`) instead of growing a queue, and never slows
+# down acquisition or the other clients.
+
+WS_GUID = b"258EAFA5-E914-47DA-95CA-C5AB0DC11B85"
+WRITE_BUFFER = 4096  # bytes a client's socket may buffer before it counts as slow
+WS_MAX_PAYLOAD = 125  # clients only send control frames, whose payload fits in the 7-bit length
+
+PAGE = b"""<!doctype html>
+<title>Scale</title>
+<h1 id="w" style="font:bold 20vw monospace">-</h1>
+<script>
+new EventSource("/events").onmessage = e => {
+  const d = JSON.parse(e.data);
+  document.getElementById("w").textContent = d.weight.toFixed(1) + " g" + (d.stable ? "" : " ~");
+};
+</script>
+"""
+
+
+def ws_frame(payload, opcode=0x1):
+    """Unmasked server-to-client WebSocket frame"""
+    length = len(payload)
+    if length < 126:
+        header = struct.pack("!BB", 0x80 | opcode, length)
+    elif length < 1 << 16:
+        header = struct.pack("!BBH", 0x80 | opcode, 126, length)
+    else:
+        header = struct.pack("!BBQ", 0x80 | opcode, 127, length)
+    return header + payload
+
+
+class Client:
+    """One streaming connection and the newest frame it has not sent yet"""
+
+    def __init__(self, writer, kind):
+        self.writer = writer
+        self.kind = kind             # "sse" or "ws"
+        self.pending = None
+        self.ready = asyncio.Event()
+        self.sent = 0
+        self.dropped = 0             # updates replaced before they could be sent
+        writer.transport.set_write_buffer_limits(high=WRITE_BUFFER)
+
+    def offer(self, frame):
+        if self.pending is not None:
+            self.dropped += 1
+        self.pending = frame
+        self.ready.set()
+
+    async def pump(self):
+        while True:
+            await self.ready.wait()
+            self.ready.clear()
+            frame, self.pending = self.pending, None
+            self.writer.write(frame)
+            await self.writer.drain()  # waits only while this client's socket is backed up
+            self.sent += 1
+
+
+class WeightServer:
+    """Serve `source()` (a JSON-able dict) as a snapshot, SSE and WebSocket stream"""
+
+    def __init__(self, source, host="127.0.0.1", port=8080, max_rate=20.0):
+        self.source = source
+        self.host = host
+        self.port = port             # 0 picks a free port; the real one is set by start()
+        self.min_interval = 1.0 / max_rate
+        self.clients = set()
+        self.seq = 0
+        self.published = 0           # updates encoded and broadcast
+        self.encode_time = 0.0
+        self.snapshot = b"{}"        # newest update as JSON
+        self.frames = {}             # newest update framed per client kind
+        self.loop = None
+        self._server = None
+        self._scheduled = False
+        self._last_publish = 0.0
+        self._ready = threading.Event()
+        self._error = None           # why the server could not start, e.g. port in use
+        self._thread = None
+
+    # ── Lifecycle ──
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="weight-server", daemon=True)
+        self._thread.start()
+        self._ready.wait(timeout=5)
+        if self._error is not None:
+            self._thread.join()
+            self._thread = None
+            raise self._error
+        return self
+
+    def stop(self):
+        if self.loop is not None and self.loop.is_running():
+            self.loop.call_soon_threadsafe(self.loop.stop)
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+            self._thread = None
+
+    def _run(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)  # this thread's loop, e.g. for gather() at shutdown
+        try:
+            self._server = self.loop.run_until_complete(asyncio.start_server(self._handle, self.host, self.port))
+        except OSError as e:
+            self._error = e  # re-raised by start() on the caller's thread
+            self.loop.close()
+            self._ready.set()
+            return
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._publish()
+        self._ready.set()
+        try:
+            self.loop.run_forever()
+        finally:
+            self._server.close()
+            tasks = asyncio.all_tasks(self.loop)
+            for task in tasks:
+                task.cancel()
+            self.loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+            self.loop.close()
+
+    # ── Publishing ──
+    def notify(self, *args):
+        """Schedule an update; safe to call from any thread, bursts are coalesced"""
+        if self.loop is not None and not self._scheduled:
+            self._scheduled = True
+            self.loop.call_soon_threadsafe(self._schedule)
+
+    def _schedule(self):
+        delay = self._last_publish + self.min_interval - time.monotonic()
+        if delay > 0:
+            self.loop.call_later(delay, self._publish)
+        else:
+            self._publish()
+
+    def _publish(self):
+        self._scheduled = False
+        self._last_publish = time.monotonic()
+        started = time.perf_counter()
+        self.seq += 1
+        update = dict(self.source(), time=time.time(), seq=self.seq)
+        payload = json.dumps(update, separators=(",", ":")).encode()
+        frames = {"sse": b"data: " + payload + b"\n\n", "ws": ws_frame(payload)}
+        self.snapshot = payload
+        self.frames = frames
+        self.encode_time += time.perf_counter() - started
+        for client in self.clients:
+            client.offer(frames[client.kind])
+        self.published += 1
+
+    # ── HTTP ──
+    async def _handle(self, reader, writer):
+        try:
+            head = await reader.readuntil(b"\r\n\r\n")
+            request, *lines = head.decode("latin-1").split("\r\n")
+            method, path, _ = request.split(" ", 2)
+            headers = {}
+            for line in lines:
+                if ":" in line:
+                    name, value = line.split(":", 1)
+                    headers[name.strip().lower()] = value.strip()
+            path = path.split("?", 1)[0]
+            if method != "GET":
+                await self._respond(writer, "405 Method Not Allowed", "text/plain", b"GET only\n")
+            elif path == "/weight":
+                await self._respond(writer, "200 OK", "application/json", self.snapshot)
+            elif path == "/":
+                await self._respond(writer, "200 OK", "text/html", PAGE)
+            elif path == "/events":
+                writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\n"
+                             b"Cache-Control: no-cache\r\nConnection: keep-alive\r\n\r\n")
+                await self._stream(Client(writer, "sse"), reader.read(1))
+            elif path == "/ws" and headers.get("upgrade", "").lower() == "websocket":
+                accept = base64.b64encode(hashlib.sha1(headers["sec-websocket-key"].encode() + WS_GUID).digest())
+                writer.write(b"HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\n"
+                             b"Connection: Upgrade\r\nSec-WebSocket-Accept: " + accept + b"\r\n\r\n")
+                await self._stream(Client(writer, "ws"), self._read_ws(reader, writer))
+            else:
+                await self._respond(writer, "404 Not Found", "text/plain", b"Not found\n")
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError, ValueError, KeyError):
+            pass
+        except asyncio.CancelledError:
+            pass  # stop(): end quietly, a cancelled handler makes asyncio log a traceback
+        finally:
+            writer.close()
+
+    async def _respond(self, writer, status, content_type, body):
+        writer.write(f"HTTP/1.1 {status}\r\nContent-Type: {content_type}\r\n"
+                     f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode() + body)
+        await writer.drain()
+
+    async def _stream(self, client, closed):
+        """Send updates to `client` until the `closed` coroutine returns (peer hung up)"""
+        self.clients.add(client)
+        client.offer(self.frames[client.kind])  # start with the current reading
+        pump = asyncio.ensure_future(client.pump())
+        watch = asyncio.ensure_future(closed)
+        try:
+            await asyncio.wait({pump, watch}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            self.clients.discard(client)
+            pump.cancel()
+            watch.cancel()
+
+    async def _read_ws(self, reader, writer):
+        """Handle client frames: answer ping and close, ignore the rest"""
+        while True:
+            first, second = await reader.readexactly(2)
+            opcode = first & 0x0F
+            length = second & 0x7F
+            if length > WS_MAX_PAYLOAD:
+                # 126/127 announce an extended length: close (1009, too big) rather than read it
+                writer.write(ws_frame(struct.pack("!H", 1009), 0x8))
+                return
+            mask = await reader.readexactly(4) if second & 0x80 else bytes(4)
+            payload = await reader.readexactly(length)
+            if opcode not in (0x8, 0x9):
+                continue
+            data = bytes(b ^ mask[i % 4] for i, b in enumerate(payload))
+            if opcode == 0x8:
+                writer.write(ws_frame(data[:2], 0x8))
+                return
+            if opcode == 0x9:
+                writer.write(ws_frame(data, 0xA))
+
+    def stats(self):
+        return {
+            "clients": len(self.clients),
+            "published": self.published,
+            "mean_encode_us": 1e6 * self.encode_time / self.published if self.published else 0.0,
+            "dropped": sum(client.dropped for client in self.clients),
+        }
+
+
+if __name__ == "__main__":
+    import argparse
+    import devices
+    from hx711_sampler import HX711Sampler
+    from change_detector import ChangeDetector
+
+    parser = argparse.ArgumentParser(description="Serve live HX711 readings over HTTP")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    args = parser.parse_args()
+
+    hx = devices.open_hx711(dout=6, sck=5)  # RASPI_BACKEND=sim to simulate
+    hx.set_reference_unit(210.0)
+    hx.tare()
+    sampler = HX711Sampler(hx)
+    detector = ChangeDetector()
+    sampler.listeners.append(detector.update)
+    def reading():
+        weight, stable = detector.state
+        return {"weight": round(weight, 2), "stable": stable}
+
+    server = WeightServer(reading, host=args.host, port=args.port)
+    detector.subscribe(server.notify)
+    sampler.start()
+    server.start()
+    print(f"Serving on http://{args.host}:{server.port}/ (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        print()
+    finally:
+        server.stop()
+        sampler.stop()